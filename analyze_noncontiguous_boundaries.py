@@ -4,40 +4,78 @@ Analyze and fix noncontiguous boundaries in city files
 1. Fix Tokyo by keeping only the main landmass
 2. Identify other cities with noncontiguous areas
 """
-import json
+import heapq
+import os
+from concurrent.futures import ProcessPoolExecutor
+from operator import itemgetter, mul
 from pathlib import Path
 from typing import List, Tuple, Dict
 import math
 
+from json_io import load_cache, load_json, save_cache, save_json
+
+EARTH_RADIUS_KM = 6371  # Earth radius in km
+
+def _shoelace(xs: List[float], ys: List[float]) -> float:
+    """Shoelace kernel over flat x/y coordinate columns"""
+    area = sum(map(mul, xs, ys[1:] + ys[:1])) - sum(map(mul, xs[1:] + xs[:1], ys))
+    return abs(area) / 2
+
 def calculate_polygon_area(coords: List[List[float]]) -> float:
-    """Calculate approximate area of a polygon using shoelace formula"""
+    """
+    Calculate the area of a lon/lat polygon in km² on a spherical Earth.
+    Projects onto a cylindrical equal-area grid (x = R*lon, y = R*sin(lat)),
+    where the planar shoelace formula gives true surface area.
+    """
     if len(coords) < 3:
         return 0
     
-    area = 0
-    n = len(coords)
-    for i in range(n):
-        j = (i + 1) % n
-        area += coords[i][0] * coords[j][1]
-        area -= coords[j][0] * coords[i][1]
-    return abs(area) / 2
+    # Split the ring into x/y columns once so the cross products run in C via map()
+    scale = math.radians(EARTH_RADIUS_KM)
+    xs = [lon * scale for lon in map(itemgetter(0), coords)]
+    ys = [EARTH_RADIUS_KM * math.sin(math.radians(lat)) for lat in map(itemgetter(1), coords)]
+    return _shoelace(xs, ys)
+
+MAIN_AREA_THRESHOLD = 95  # Main polygon share (%) below which a boundary is flagged
+
+# Per-file analysis results, keyed by file path
+CACHE_FILE = Path('.boundary_cache.json')
+CACHE_VERSION = 2  # Bump whenever the area metric changes
+
+def _bbox_area(coords: List[List[float]]) -> float:
+    """Area in km² of a ring's bounding box on the equal-area grid; an upper bound on its area"""
+    lons = list(map(itemgetter(0), coords))
+    lats = list(map(itemgetter(1), coords))
+    width = math.radians(max(lons) - min(lons)) * EARTH_RADIUS_KM
+    height = (math.sin(math.radians(max(lats))) - math.sin(math.radians(min(lats)))) * EARTH_RADIUS_KM
+    return width * height
 
 def analyze_multipolygon(geometry: Dict) -> Tuple[int, List[float], float]:
     """
     Analyze a MultiPolygon geometry
     Returns: (polygon_count, areas_list, main_area_percentage)
+    When the main polygon clearly dominates, areas_list holds only its area and
+    main_area_percentage is a lower bound that is already above MAIN_AREA_THRESHOLD
     """
     if geometry['type'] != 'MultiPolygon':
         return 1, [1.0], 100.0
     
     polygons = geometry['coordinates']
-    areas = []
-    
-    for polygon in polygons:
-        # Use the outer ring (first coordinate array) for area calculation
-        outer_ring = polygon[0]
-        area = calculate_polygon_area(outer_ring)
-        areas.append(area)
+    if not polygons:
+        return 0, [], 0
+    
+    # Vertex count is a cheap proxy for area: measure the most detailed polygon first and
+    # stop if even the bounding boxes of all the others cannot pull it under the threshold
+    polygons = sorted(polygons, key=lambda polygon: len(polygon[0]), reverse=True)
+    main_area = calculate_polygon_area(polygons[0][0])
+    if main_area > 0:
+        rest_upper_bound = sum(map(_bbox_area, map(itemgetter(0), polygons[1:])))
+        main_lower_bound = main_area / (main_area + rest_upper_bound) * 100
+        if main_lower_bound >= MAIN_AREA_THRESHOLD:
+            return len(polygons), [main_area], main_lower_bound
+    
+    # Use the outer ring (first coordinate array) of every polygon in one map() pass
+    areas = [main_area] + list(map(calculate_polygon_area, map(itemgetter(0), polygons[1:])))
     
     total_area = sum(areas)
     if total_area == 0:
@@ -53,8 +91,7 @@ def fix_tokyo_boundaries():
     """Remove outlier islands from Tokyo, keeping only the main landmass"""
     print("🗾 Fixing Tokyo boundaries...")
     
-    with open('tokyo.geojson', 'r') as f:
-        data = json.load(f)
+    data = load_json('tokyo.geojson')
     
     if not data['features']:
         print("❌ No features found in Tokyo file")
@@ -75,15 +112,15 @@ def fix_tokyo_boundaries():
         area = calculate_polygon_area(outer_ring)
         polygon_areas.append((i, area, len(outer_ring)))
     
-    # Sort by area to find the largest
-    polygon_areas.sort(key=lambda x: x[1], reverse=True)
+    # Only the top 5 are reported, so select them without sorting every polygon
+    by_area = itemgetter(1)
     
     print("   Polygon areas (largest first):")
-    for i, (idx, area, points) in enumerate(polygon_areas[:5]):  # Show top 5
-        print(f"      #{idx+1}: {area:.2f} area units ({points} points)")
+    for idx, area, points in heapq.nlargest(5, polygon_areas, key=by_area):
+        print(f"      #{idx+1}: {area:.2f} km² ({points} points)")
     
     # Keep only the largest polygon (main landmass)
-    main_polygon_idx = polygon_areas[0][0]
+    main_polygon_idx = max(polygon_areas, key=by_area)[0]
     main_polygon = polygons[main_polygon_idx]
     
     # Update the geometry to contain only the main polygon
@@ -94,46 +131,97 @@ def fix_tokyo_boundaries():
     data['features'][0]['properties']['note'] = "Outlying islands removed for cleaner comparison"
     
     # Save the cleaned version
-    with open('tokyo.geojson', 'w') as f:
-        json.dump(data, f, indent=2)
+    save_json('tokyo.geojson', data)
     
     removed_count = len(polygons) - 1
     print(f"✅ Tokyo cleaned: kept main landmass, removed {removed_count} outlying islands")
 
+def _analyze_file(file_path: str) -> Tuple[int, int, float]:
+    """Parse one boundary file and return (polygon_count, area_count, main_percentage)"""
+    data = load_json(file_path)
+    if not data.get('features'):
+        return 0, 0, 0
+    
+    polygon_count, areas, main_percentage = analyze_multipolygon(data['features'][0]['geometry'])
+    return polygon_count, len(areas), main_percentage
+
 def analyze_all_boundaries() -> List[Dict]:
     """Analyze all boundary files for noncontiguous areas"""
     print("\n🔍 Analyzing all boundary files for noncontiguous areas...")
     
-    boundary_files = [f for f in Path('.').glob('*.geojson') if not f.name.endswith('-basic.geojson')]
     issues = []
-    
-    for file_path in sorted(boundary_files):
-        try:
-            with open(file_path, 'r') as f:
-                data = json.load(f)
+    cache = load_cache(CACHE_FILE, CACHE_VERSION)
+    stats = {}
+    results = {}
+    pending = []
+    
+    # One lazy directory pass; DirEntry caches its stat result, so each file is stat'ed once.
+    # Report order comes from generate_report's sort, so the listing is not sorted here
+    with os.scandir('.') as entries:
+        for entry in entries:
+            if not entry.name.endswith('.geojson') or entry.name.endswith('-basic.geojson'):
+                continue
             
-            if not data.get('features'):
+            file_path = Path(entry.name)
+            try:
+                stat = entry.stat()
+            except OSError as e:
+                print(f"⚠️  Error analyzing {file_path}: {e}")
                 continue
-                
-            geometry = data['features'][0]['geometry']
-            city_name = file_path.stem.replace('-', ' ').title()
             
-            polygon_count, areas, main_percentage = analyze_multipolygon(geometry)
+            stats[file_path] = stat
+            cached = cache.get(str(file_path))
             
-            # Flag cities with multiple polygons where main area is less than 95% of total
-            if polygon_count > 1 and main_percentage < 95:
-                issues.append({
-                    'city': city_name,
-                    'file': str(file_path),
+            # Reuse the stored metrics when the file is unchanged since the last run
+            if cached and cached['size'] == stat.st_size and cached['mtime_ns'] == stat.st_mtime_ns:
+                results[file_path] = (cached['polygon_count'], cached['area_count'], cached['main_percentage'])
+            else:
+                pending.append(file_path)
+    
+    # Files are independent, so parse and measure the changed ones on all cores
+    if pending:
+        with ProcessPoolExecutor() as executor:
+            futures = {file_path: executor.submit(_analyze_file, str(file_path)) for file_path in pending}
+            for file_path, future in futures.items():
+                try:
+                    polygon_count, area_count, main_percentage = future.result()
+                except Exception as e:
+                    print(f"⚠️  Error analyzing {file_path}: {e}")
+                    continue
+                
+                stat = stats[file_path]
+                results[file_path] = (polygon_count, area_count, main_percentage)
+                cache[str(file_path)] = {
+                    'version': CACHE_VERSION,
+                    'size': stat.st_size,
+                    'mtime_ns': stat.st_mtime_ns,
                     'polygon_count': polygon_count,
-                    'main_percentage': main_percentage,
-                    'total_areas': len(areas),
-                    'size_kb': file_path.stat().st_size // 1024
-                })
-        
-        except Exception as e:
-            print(f"⚠️  Error analyzing {file_path}: {e}")
+                    'area_count': area_count,
+                    'main_percentage': main_percentage
+                }
     
+    for file_path, stat in stats.items():
+        if file_path not in results:
+            continue
+        
+        polygon_count, area_count, main_percentage = results[file_path]
+        if not polygon_count:
+            continue
+            
+        city_name = file_path.stem.replace('-', ' ').title()
+        
+        # Flag cities with multiple polygons where main area is less than 95% of total
+        if polygon_count > 1 and main_percentage < MAIN_AREA_THRESHOLD:
+            issues.append({
+                'city': city_name,
+                'file': str(file_path),
+                'polygon_count': polygon_count,
+                'main_percentage': main_percentage,
+                'total_areas': area_count,
+                'size_kb': stat.st_size // 1024
+            })
+    
+    save_cache(CACHE_FILE, cache)
     return issues
 
 def generate_report(issues: List[Dict]):
@@ -148,7 +236,7 @@ def generate_report(issues: List[Dict]):
     print(f"Found {len(issues)} cities with potential noncontiguous boundary issues:\n")
     
     # Sort by severity (lower main percentage = more fragmented)
-    issues.sort(key=lambda x: x['main_percentage'])
+    issues.sort(key=itemgetter('main_percentage', 'file'))
     
     for i, issue in enumerate(issues, 1):
         severity = "🔴 High" if issue['main_percentage'] < 50 else "🟡 Medium" if issue['main_percentage'] < 80 else "🟢 Low"
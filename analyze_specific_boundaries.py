@@ -3,10 +3,12 @@
 Analyze specific boundary issues for Hong Kong, Sydney, Asuncion, and Singapore
 """
 
-import json
 import os
+from operator import itemgetter
 
-def analyze_boundary(city_id):
+from json_io import load_json
+
+def analyze_boundary(city_id, existing_files):
     """Analyze boundary file and available alternatives"""
     print(f"\n=== {city_id.upper().replace('-', ' ')} ===")
     
@@ -17,11 +19,10 @@ def analyze_boundary(city_id):
     ]
     
     for filename in files_to_check:
-        if os.path.exists(filename):
+        if filename in existing_files:
             print(f"\n{filename}:")
             try:
-                with open(filename, 'r') as f:
-                    data = json.load(f)
+                data = load_json(filename)
                 
                 if not data.get('features'):
                     print("  ❌ No features")
@@ -39,8 +40,8 @@ def analyze_boundary(city_id):
                 # Calculate approximate area
                 if geom['type'] == 'Polygon':
                     coords = geom['coordinates'][0]
-                    lons = [c[0] for c in coords]
-                    lats = [c[1] for c in coords]
+                    lons = list(map(itemgetter(0), coords))
+                    lats = list(map(itemgetter(1), coords))
                     bbox_area = (max(lons) - min(lons)) * (max(lats) - min(lats))
                     print(f"  Area (bbox): {bbox_area:.6f}")
                     print(f"  Points: {len(coords)}")
@@ -75,5 +76,9 @@ def analyze_boundary(city_id):
 # Analyze each problematic city
 cities = ['hong-kong', 'sydney', 'asuncion', 'singapore']
 
+# One directory listing answers every existence check below
+with os.scandir('.') as entries:
+    existing_files = {entry.name for entry in entries}
+
 for city in cities:
-    analyze_boundary(city)
\ No newline at end of file
+    analyze_boundary(city, existing_files)
\ No newline at end of file
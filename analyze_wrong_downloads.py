@@ -2,8 +2,55 @@
 """
 Analyze what went wrong with the boundary downloads to understand the failures
 """
-import json
+import math
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from operator import itemgetter
 from pathlib import Path
+from typing import Dict
+
+from json_io import load_first_feature, load_json
+
+def measure_wrong_boundary(backup_file: str) -> Dict:
+    """Load one backup boundary and measure its center and bounding box"""
+    try:
+        feature = load_first_feature(backup_file)
+        
+        if feature is None:
+            return {'status': 'no_features'}
+            
+        properties = feature.get('properties', {})
+        geometry = feature['geometry']
+        
+        # Calculate center of wrong boundary
+        if geometry['type'] == 'MultiPolygon':
+            # Flatten polygons -> rings -> points without an intermediate extend loop
+            all_coords = list(chain.from_iterable(chain.from_iterable(geometry['coordinates'])))
+        elif geometry['type'] == 'Polygon':
+            all_coords = geometry['coordinates'][0]
+        else:
+            return {'status': 'unsupported_geometry'}
+        
+        if not all_coords:
+            return {'status': 'empty'}
+            
+        # Split into lon/lat columns in C, then reduce each column with builtins
+        lons = list(map(itemgetter(0), all_coords))
+        lats = list(map(itemgetter(1), all_coords))
+        
+        bbox_width = max(lons) - min(lons)
+        bbox_height = max(lats) - min(lats)
+        
+        return {
+            'status': 'ok',
+            'downloaded_name': properties.get('name', 'Unknown'),
+            'actual_center': [sum(lons)/len(lons), sum(lats)/len(lats)],
+            'bbox_width': bbox_width,
+            'bbox_height': bbox_height,
+            'bbox_area': bbox_width * bbox_height
+        }
+    except Exception as e:
+        return {'status': 'error', 'error': str(e)}
 
 def analyze_wrong_boundaries():
     """Analyze the backed up wrong boundary files to understand what happened"""
@@ -11,80 +58,71 @@ def analyze_wrong_boundaries():
     print("=" * 60)
     
     # Cities we fixed and their issues
-    wrong_cities = [
+    wrong_cities = frozenset([
         'stockholm', 'porto', 'barcelona', 'athens', 'dublin', 
         'sapporo', 'brisbane', 'bordeaux', 'toulouse', 'lyon', 'munich'
-    ]
+    ])
     
     # Load cities database for expected coordinates
-    with open('cities-database.json', 'r') as f:
-        cities_db = json.load(f)
+    cities_db = load_json('cities-database.json')
     
-    city_coords = {}
-    for city in cities_db['cities']:
-        city_coords[city['id']] = {
+    city_coords = {
+        city['id']: {
             'name': city['name'],
-            'country': city['country'], 
-            'coords': [city['coordinates'][1], city['coordinates'][0]]  # [lon, lat]
+            'country': city['country'],
+            'coords': (city['coordinates'][1], city['coordinates'][0])  # (lon, lat)
         }
+        for city in cities_db['cities']
+    }
+    
+    for city_id in sorted(wrong_cities - city_coords.keys()):
+        print(f"⚠️  City {city_id} not found in database")
     
     analysis_results = []
     
-    for city_id in wrong_cities:
-        backup_file = f"{city_id}-wrong-boundary-backup.geojson"
+    # Parse and measure every available backup file in parallel; results come back in input order
+    known_cities = sorted(wrong_cities & city_coords.keys())
+    backup_files = {city_id: f"{city_id}-wrong-boundary-backup.geojson" for city_id in known_cities}
+    available = [city_id for city_id, backup_file in backup_files.items() if Path(backup_file).exists()]
+    with ProcessPoolExecutor() as executor:
+        measurements = dict(zip(available, executor.map(measure_wrong_boundary,
+                                                        [backup_files[city_id] for city_id in available])))
+    
+    for city_id in known_cities:
+        backup_file = backup_files[city_id]
         
-        if not Path(backup_file).exists():
+        if city_id not in measurements:
             print(f"⚠️  Backup file not found: {backup_file}")
             continue
             
-        city_info = city_coords.get(city_id, {})
-        expected_coords = city_info.get('coords', [0, 0])
-        expected_name = city_info.get('name', city_id)
-        expected_country = city_info.get('country', 'Unknown')
+        city_info = city_coords[city_id]
+        expected_coords = city_info['coords']
+        expected_name = city_info['name']
+        expected_country = city_info['country']
         
         print(f"\n📋 Analyzing {expected_name}, {expected_country}")
         print(f"   Expected location: [{expected_coords[0]:.3f}, {expected_coords[1]:.3f}]")
         
         try:
-            with open(backup_file, 'r') as f:
-                wrong_data = json.load(f)
+            measurement = measurements[city_id]
             
-            if not wrong_data.get('features'):
+            if measurement['status'] == 'error':
+                raise RuntimeError(measurement['error'])
+            if measurement['status'] == 'no_features':
                 print("   ❌ No features in wrong file")
                 continue
-                
-            feature = wrong_data['features'][0]
-            properties = feature.get('properties', {})
-            geometry = feature['geometry']
-            
-            # Get name from properties
-            downloaded_name = properties.get('name', 'Unknown')
-            
-            # Calculate center of wrong boundary
-            if geometry['type'] == 'MultiPolygon':
-                all_coords = []
-                for polygon in geometry['coordinates']:
-                    for ring in polygon:
-                        all_coords.extend(ring)
-            elif geometry['type'] == 'Polygon':
-                all_coords = geometry['coordinates'][0]
-            else:
-                continue
-            
-            if not all_coords:
+            if measurement['status'] != 'ok':
                 continue
-                
-            lons = [coord[0] for coord in all_coords]
-            lats = [coord[1] for coord in all_coords]
             
-            actual_center = [sum(lons)/len(lons), sum(lats)/len(lats)]
-            bbox_width = max(lons) - min(lons)
-            bbox_height = max(lats) - min(lats)
-            bbox_area = bbox_width * bbox_height
+            downloaded_name = measurement['downloaded_name']
+            actual_center = measurement['actual_center']
+            bbox_width = measurement['bbox_width']
+            bbox_height = measurement['bbox_height']
+            bbox_area = measurement['bbox_area']
             
             # Calculate distance from expected
-            distance = ((actual_center[0] - expected_coords[0])**2 + 
-                       (actual_center[1] - expected_coords[1])**2)**0.5
+            distance = math.hypot(actual_center[0] - expected_coords[0],
+                                  actual_center[1] - expected_coords[1])
             
             print(f"   Downloaded: '{downloaded_name}'")
             print(f"   Actual center: [{actual_center[0]:.3f}, {actual_center[1]:.3f}]")
@@ -5,114 +5,228 @@ Area Scaling Analyzer
 Demonstrates how city statistics can be used for meaningful area-based comparisons
 and scaling visualizations in the city comparison tool.
 """
-import json
+import bisect
+import sys
+from collections import namedtuple
+from dataclasses import dataclass
 from typing import Dict, List, Any
 import math
 
+from json_io import load_json, save_json
+
+# One city's density metrics, in the same order as AreaScalingAnalyzer.densities
+DensityMetrics = namedtuple('DensityMetrics', [
+    'population_density', 'gdp_per_km2_millions', 'metro_stations_per_km2', 'museums_per_km2',
+    'hospitals_per_km2', 'universities_per_km2', 'skyscrapers_per_km2',
+    'tourists_per_km2_thousands', 'restaurants_per_km2'
+])
+
+@dataclass(slots=True)
+class CityTable:
+    """Structure-of-arrays view of the numeric city fields: one list per field, indexed by city position"""
+    names: List[str]
+    name_to_idx: Dict[str, int]
+    area: List[float]
+    pop: List[float]
+    pop_density: List[float]
+    gdp: List[float]
+    metro: List[float]
+    museums: List[float]
+    hospitals: List[float]
+    univ: List[float]
+    sky: List[float]
+    tourists: List[float]
+    restaurants_per_1000: List[float]
+    green_space: List[float]
+    cultural_score: List[float]
+    
+    @classmethod
+    def from_cities(cls, cities: Dict[str, Dict]) -> 'CityTable':
+        """Build the table from city records keyed by name, keeping their order"""
+        names = list(cities)
+        rows = list(cities.values())
+        return cls(
+            names=names,
+            name_to_idx={name: i for i, name in enumerate(names)},
+            area=[city['geography']['area_city_km2'] for city in rows],
+            pop=[city['demographics']['population_city'] for city in rows],
+            pop_density=[city['demographics']['population_density'] for city in rows],
+            gdp=[city['economic']['gdp_billions_usd'] for city in rows],
+            metro=[city['infrastructure']['metro_stations'] for city in rows],
+            museums=[city['infrastructure']['museums'] for city in rows],
+            hospitals=[city['infrastructure']['hospitals'] for city in rows],
+            univ=[city['infrastructure']['universities'] for city in rows],
+            sky=[city['urban_features']['skyscrapers_150m_plus'] for city in rows],
+            tourists=[city['tourism_culture']['annual_tourists_millions'] for city in rows],
+            restaurants_per_1000=[city['urban_features']['restaurants_per_1000'] for city in rows],
+            green_space=[city['geography']['green_space_percent'] for city in rows],
+            cultural_score=[city['tourism_culture']['cultural_significance_score'] for city in rows]
+        )
+
 class AreaScalingAnalyzer:
     def __init__(self, database_file: str = 'city_statistics_database.json'):
-        with open(database_file, 'r') as f:
-            self.data = json.load(f)
+        self.data = load_json(database_file)
         self.cities = {city['basic_info']['name']: city for city in self.data['cities']}
+        
+        # Hot paths index this table by city position instead of walking the nested city dicts
+        self.table = CityTable.from_cities(self.cities)
+        
+        self.densities = self._compute_densities()
+        
+        # Per-city rows of the same values, so looking up one city's metrics allocates nothing
+        self._metric_rows = list(map(DensityMetrics._make,
+                                     zip(*(self.densities[metric] for metric in DensityMetrics._fields))))
+    
+    def _compute_densities(self) -> Dict[str, List[float]]:
+        """Compute every density metric for all cities at once, one column per metric."""
+        t = self.table
+        area = t.area
+        return {
+            'population_density': list(t.pop_density),
+            'gdp_per_km2_millions': [gdp * 1000 / a for gdp, a in zip(t.gdp, area)],
+            'metro_stations_per_km2': [n / a for n, a in zip(t.metro, area)],
+            'museums_per_km2': [n / a for n, a in zip(t.museums, area)],
+            'hospitals_per_km2': [n / a for n, a in zip(t.hospitals, area)],
+            'universities_per_km2': [n / a for n, a in zip(t.univ, area)],
+            'skyscrapers_per_km2': [n / a for n, a in zip(t.sky, area)],
+            'tourists_per_km2_thousands': [n * 1000 / a for n, a in zip(t.tourists, area)],
+            'restaurants_per_km2': [(r * pop / 1000) / a
+                                    for r, pop, a in zip(t.restaurants_per_1000, t.pop, area)]
+        }
+    
+    def metrics_for(self, idx: int) -> DensityMetrics:
+        """Return the density metrics of the city at table position `idx`."""
+        return self._metric_rows[idx]
     
     def calculate_density_metrics(self, city_name: str) -> Dict[str, float]:
         """Calculate various density metrics for a city."""
-        city = self.cities[city_name]
-        area = city['geography']['area_city_km2']
-        
-        metrics = {
-            'population_density': city['demographics']['population_density'],
-            'gdp_per_km2_millions': city['economic']['gdp_billions_usd'] * 1000 / area,
-            'metro_stations_per_km2': city['infrastructure']['metro_stations'] / area,
-            'museums_per_km2': city['infrastructure']['museums'] / area,
-            'hospitals_per_km2': city['infrastructure']['hospitals'] / area,
-            'universities_per_km2': city['infrastructure']['universities'] / area,
-            'skyscrapers_per_km2': city['urban_features']['skyscrapers_150m_plus'] / area,
-            'tourists_per_km2_thousands': city['tourism_culture']['annual_tourists_millions'] * 1000 / area,
-            'restaurants_per_km2': (city['urban_features']['restaurants_per_1000'] * 
-                                   city['demographics']['population_city'] / 1000) / area
-        }
-        
-        return metrics
+        return self.metrics_for(self.table.name_to_idx[city_name])._asdict()
+    
+    def _density(self, city_name: str, metric: str) -> float:
+        """Look up a single precomputed density without building the full metrics dict."""
+        return self.densities[metric][self.table.name_to_idx[city_name]]
     
     def scale_city_by_density(self, base_city: str, target_city: str, metric: str) -> Dict[str, Any]:
         """Scale one city to match another's density in a specific metric."""
-        base_metrics = self.calculate_density_metrics(base_city)
-        target_metrics = self.calculate_density_metrics(target_city)
+        base_area = self.table.area[self.table.name_to_idx[base_city]]
+        return self._scaling_result(base_city, target_city, metric,
+                                    self._density(base_city, metric),
+                                    self._density(target_city, metric), base_area)
+    
+    def _scaling_result(self, base_city: str, target_city: str, metric: str,
+                        base_density: float, target_density: float, base_area: float,
+                        label: str = None) -> Dict[str, Any]:
+        """Build the scaling record for a city pair from already-computed densities.
         
-        base_area = self.cities[base_city]['geography']['area_city_km2']
-        scaling_factor = target_metrics[metric] / base_metrics[metric]
+        Callers looping over many pairs of one metric can pass its display `label` to avoid re-deriving it.
+        """
+        if label is None:
+            label = metric.replace('_', ' ')
+        scaling_factor = target_density / base_density
         scaled_area = base_area * scaling_factor
+        direction = 'larger' if scaling_factor > 1 else 'smaller'
         
         return {
             'base_city': base_city,
             'target_city': target_city,
             'metric': metric,
-            'base_density': base_metrics[metric],
-            'target_density': target_metrics[metric],
+            'base_density': base_density,
+            'target_density': target_density,
             'base_area_km2': base_area,
             'scaled_area_km2': scaled_area,
             'scaling_factor': scaling_factor,
-            'size_comparison': f"If {base_city} had {target_city}'s {metric.replace('_', ' ')}, it would be {scaled_area:.1f} km² ({scaling_factor:.2f}x {('larger' if scaling_factor > 1 else 'smaller')})"
+            'size_comparison': "If %s had %s's %s, it would be %.1f km² (%.2fx %s)" % (
+                base_city, target_city, label, scaled_area, scaling_factor, direction)
         }
     
     def compare_cities_normalized(self, cities: List[str], normalize_by: str) -> Dict[str, Any]:
         """Compare cities after normalizing by a specific metric (e.g., normalize all to same area)."""
-        comparisons = {}
-        
-        for city in cities:
-            metrics = self.calculate_density_metrics(city)
-            city_data = self.cities[city]
-            
-            if normalize_by == 'area':
-                # Normalize to 1000 km² for comparison
-                base_area = city_data['geography']['area_city_km2']
-                norm_factor = 1000 / base_area
-                
-                comparisons[city] = {
-                    'normalized_population': city_data['demographics']['population_city'] * norm_factor,
-                    'normalized_gdp_billions': city_data['economic']['gdp_billions_usd'] * norm_factor,
-                    'normalized_museums': city_data['infrastructure']['museums'] * norm_factor,
-                    'normalized_restaurants': metrics['restaurants_per_km2'] * 1000,
-                    'normalized_area_km2': 1000,
-                    'green_space_percent': city_data['geography']['green_space_percent']
-                }
-        
-        return comparisons
+        t = self.table
+        indices = [t.name_to_idx[city] for city in cities]
+        
+        if normalize_by != 'area':
+            return {}
+        
+        # Normalize to 1000 km² for comparison, one column at a time over the requested cities
+        norm_factors = [1000 / t.area[i] for i in indices]
+        norm_pop = [t.pop[i] * nf for i, nf in zip(indices, norm_factors)]
+        norm_gdp = [t.gdp[i] * nf for i, nf in zip(indices, norm_factors)]
+        norm_museums = [t.museums[i] * nf for i, nf in zip(indices, norm_factors)]
+        restaurants_per_km2 = self.densities['restaurants_per_km2']
+        
+        return {
+            city: {
+                'normalized_population': norm_pop[k],
+                'normalized_gdp_billions': norm_gdp[k],
+                'normalized_museums': norm_museums[k],
+                'normalized_restaurants': restaurants_per_km2[i] * 1000,
+                'normalized_area_km2': 1000,
+                'green_space_percent': t.green_space[i]
+            }
+            for k, (city, i) in enumerate(zip(cities, indices))
+        }
+    
+    @staticmethod
+    def _significant_pairs(densities: List[float], threshold: float) -> List[tuple]:
+        """Return (base, target) index pairs whose densities differ by more than `threshold` orders of magnitude."""
+        log10 = math.log10
+        logs = [log10(d) for d in densities]
+        order = sorted(range(len(logs)), key=logs.__getitem__)
+        sorted_logs = [logs[k] for k in order]
+        
+        # In log space the matches for each base are a prefix and a suffix of the sorted order, so
+        # bisect finds them without comparing every pair. The window is widened slightly and each
+        # candidate re-checked with the exact ratio test, so rounding cannot change the result.
+        # Pairs come out of the two slices in density order and are put in index order once at the end.
+        window = threshold - 1e-9
+        pairs = []
+        for i, base in enumerate(densities):
+            lo = bisect.bisect_left(sorted_logs, logs[i] - window)
+            # Thresholds within the widening margin of zero give an inverted window; keep the slices
+            # disjoint so every other city is a candidate exactly once
+            hi = max(lo, bisect.bisect_right(sorted_logs, logs[i] + window))
+            for candidates in (order[:lo], order[hi:]):
+                pairs.extend((i, j) for j in candidates
+                             if j != i and abs(log10(densities[j] / base)) > threshold)
+        pairs.sort()
+        return pairs
     
     def generate_scaling_insights(self) -> List[Dict[str, Any]]:
         """Generate interesting scaling insights from the database."""
         insights = []
         
-        cities = list(self.cities.keys())
+        cities = self.table.names
         
         # Population density scaling
-        for base in cities:
-            for target in cities:
-                if base != target:
-                    scaling = self.scale_city_by_density(base, target, 'population_density')
-                    if abs(math.log10(scaling['scaling_factor'])) > 0.3:  # Significant difference
-                        insights.append({
-                            'type': 'population_density',
-                            'insight': scaling['size_comparison'],
-                            'data': scaling
-                        })
+        metric = 'population_density'
+        pop_density = self.densities[metric]
+        label = metric.replace('_', ' ')  # Hoisted out of the pair loop
+        for i, j in self._significant_pairs(pop_density, 0.3):  # Significant difference
+            scaling = self._scaling_result(cities[i], cities[j], metric,
+                                           pop_density[i], pop_density[j], self.table.area[i], label)
+            insights.append({
+                'type': 'population_density',
+                'insight': scaling['size_comparison'],
+                'data': scaling
+            })
         
         # Economic density comparisons
-        for base in cities:
-            for target in cities:
-                if base != target:
-                    scaling = self.scale_city_by_density(base, target, 'gdp_per_km2_millions')
-                    if abs(math.log10(scaling['scaling_factor'])) > 0.5:  # Very significant difference
-                        insights.append({
-                            'type': 'economic_density',
-                            'insight': f"{base} generates ${scaling['base_density']:.1f}M per km², while {target} generates ${scaling['target_density']:.1f}M per km²",
-                            'data': scaling
-                        })
+        metric = 'gdp_per_km2_millions'
+        gdp_density = self.densities[metric]
+        label = metric.replace('_', ' ')  # Hoisted out of the pair loop
+        for i, j in self._significant_pairs(gdp_density, 0.5):  # Very significant difference
+            base, target = cities[i], cities[j]
+            scaling = self._scaling_result(base, target, metric,
+                                           gdp_density[i], gdp_density[j], self.table.area[i], label)
+            insights.append({
+                'type': 'economic_density',
+                'insight': "%s generates $%.1fM per km², while %s generates $%.1fM per km²" % (
+                    base, gdp_density[i], target, gdp_density[j]),
+                'data': scaling
+            })
         
         # Cultural density (museums per km²)
-        cultural_densities = [(city, self.calculate_density_metrics(city)['museums_per_km2']) 
-                            for city in cities]
+        cultural_densities = list(zip(cities, self.densities['museums_per_km2']))
         cultural_densities.sort(key=lambda x: x[1], reverse=True)
         
         insights.append({
@@ -131,16 +245,16 @@ class AreaScalingAnalyzer:
             'density_comparisons': {}
         }
         
-        for city_name, city_data in self.cities.items():
-            metrics = self.calculate_density_metrics(city_name)
-            
+        t = self.table
+        for idx, city_name in enumerate(t.names):
             viz_data['cities'][city_name] = {
-                'base_area_km2': city_data['geography']['area_city_km2'],
-                'population': city_data['demographics']['population_city'],
-                'coordinates': city_data['basic_info']['coordinates'],
-                'densities': metrics,
-                'green_space_percent': city_data['geography']['green_space_percent'],
-                'cultural_significance_score': city_data['tourism_culture']['cultural_significance_score']
+                'base_area_km2': t.area[idx],
+                'population': t.pop[idx],
+                # Coordinates are not numeric columns, so they still come from the city record
+                'coordinates': self.cities[city_name]['basic_info']['coordinates'],
+                'densities': self.metrics_for(idx)._asdict(),
+                'green_space_percent': t.green_space[idx],
+                'cultural_significance_score': t.cultural_score[idx]
             }
         
         # Generate key scaling examples for visualization
@@ -188,9 +302,10 @@ def main():
     for example in viz_data['scaling_examples']:
         print(f"   {example['size_comparison']}")
     
-    # Save visualization data
-    with open('city_scaling_visualization_data.json', 'w') as f:
-        json.dump(viz_data, f, indent=2)
+    # Save visualization data; compact by default since the web frontend consumes it,
+    # pass --pretty for an indented copy when debugging
+    pretty = '--pretty' in sys.argv[1:]
+    save_json('city_scaling_visualization_data.json', viz_data, compact=not pretty)
     
     print(f"\n💾 Visualization data saved to: city_scaling_visualization_data.json")
     print(f"📈 Ready for integration with enhanced-comparison.html!")
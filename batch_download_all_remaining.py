@@ -3,12 +3,15 @@
 Comprehensive batch download script for ALL remaining cities needing detailed boundaries
 Based on city-boundary-sources.md reference file
 """
-import json
-import subprocess
+import asyncio
 import os
-import time
+import requests
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from json_io import loads_json, save_json
+from rate_limit import reserve_request_slot, wait_for_rate_limit
+
 # All remaining cities that need detailed boundaries (positions 21-101, excluding already processed)
 CITIES = {
     # Phase 4 (Already downloaded some, but including for completeness)
@@ -92,41 +95,45 @@ CITIES = {
     # Additional cities can be added here
 }
 
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+# Shared across worker threads so connections to the OSM service are reused
+session = requests.Session()
+
+# Concurrent OSM downloads; the shared rate limiter still spaces out request starts
+MAX_WORKERS = 4
+
 def download_osm_boundary(city_id, osm_id, delay=1):
     """Download boundary from OSM polygons service with rate limiting"""
     url = f"https://polygons.openstreetmap.fr/get_geojson.py?id={osm_id}&params=0"
-    filename = f"{city_id}-raw.json"
     
     try:
-        # Add delay to be respectful to the API
-        time.sleep(delay)
+        # Space out requests to be respectful to the API
+        wait_for_rate_limit(delay)
         
-        result = subprocess.run(['curl', '-L', '-s', url], 
-                              capture_output=True, text=True, check=True)
+        response = session.get(url, timeout=30)
+        response.raise_for_status()
         
         # Validate JSON
-        data = json.loads(result.stdout)
+        data = loads_json(response.content)
         
         # Check if we got valid geometry data
         if 'type' not in data:
             raise Exception("Invalid geometry data received")
             
-        with open(filename, 'w') as f:
-            json.dump(data, f)
-            
-        print(f"✅ {city_id}: Downloaded {len(result.stdout):,} chars")
-        return filename
+        print(f"✅ {city_id}: Downloaded {len(response.content):,} bytes")
+        return data
         
-    except (subprocess.CalledProcessError, json.JSONDecodeError, Exception) as e:
+    except (requests.RequestException, ValueError, Exception) as e:
         print(f"❌ {city_id}: Failed - {e}")
         return None
 
-def convert_to_feature_collection(city_id, raw_file, city_info):
-    """Convert raw OSM data to proper FeatureCollection"""
+def convert_to_feature_collection(city_id, raw_data, city_info):
+    """Convert downloaded OSM geometry to proper FeatureCollection"""
     try:
-        with open(raw_file, 'r') as f:
-            raw_data = json.load(f)
-        
         # Create feature with proper metadata
         feature = {
             'type': 'Feature',
@@ -147,11 +154,7 @@ def convert_to_feature_collection(city_id, raw_file, city_info):
         
         # Write final boundary file
         output_file = f"{city_id}.geojson"
-        with open(output_file, 'w') as f:
-            json.dump(feature_collection, f)
-        
-        # Clean up raw file
-        os.remove(raw_file)
+        save_json(output_file, feature_collection, compact=True)
         
         size = Path(output_file).stat().st_size
         print(f"✅ {city_id}: Processed to FeatureCollection ({size:,} bytes)")
@@ -161,49 +164,103 @@ def convert_to_feature_collection(city_id, raw_file, city_info):
         print(f"❌ {city_id}: Conversion failed - {e}")
         return None
 
+def process_osm_city(city_id, city_info):
+    """Download one OSM boundary and convert it to a FeatureCollection"""
+    raw_data = download_osm_boundary(city_id, city_info['osm_id'], delay=0.5)
+    if raw_data is None:
+        return None
+    return convert_to_feature_collection(city_id, raw_data, city_info)
+
+async def download_osm_boundary_async(http, city_id, osm_id, delay=1):
+    """Async counterpart of download_osm_boundary; shares its rate limiter"""
+    url = f"https://polygons.openstreetmap.fr/get_geojson.py?id={osm_id}&params=0"
+    
+    try:
+        # Space out requests to be respectful to the API
+        wait = reserve_request_slot(delay)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        
+        async with http.get(url, timeout=aiohttp.ClientTimeout(total=30)) as response:
+            response.raise_for_status()
+            content = await response.read()
+        
+        # Validate JSON
+        data = loads_json(content)
+        
+        # Check if we got valid geometry data
+        if 'type' not in data:
+            raise Exception("Invalid geometry data received")
+            
+        print(f"✅ {city_id}: Downloaded {len(content):,} bytes")
+        return data
+        
+    except Exception as e:
+        print(f"❌ {city_id}: Failed - {e}")
+        return None
+
+async def process_osm_cities_async(pending):
+    """Download and convert the pending OSM cities on one event loop, at most MAX_WORKERS in flight"""
+    semaphore = asyncio.Semaphore(MAX_WORKERS)
+    
+    async def process(http, city_id, city_info):
+        async with semaphore:
+            raw_data = await download_osm_boundary_async(http, city_id, city_info['osm_id'], delay=0.5)
+        if raw_data is None:
+            return None
+        # Encoding and writing the boundary blocks, so keep it off the event loop
+        return await asyncio.to_thread(convert_to_feature_collection, city_id, raw_data, city_info)
+    
+    async with aiohttp.ClientSession() as http:
+        return await asyncio.gather(*(process(http, city_id, city_info) for city_id, city_info in pending))
+
+# Approximate city centers (lat, lng) for creating placeholder squares
+PLACEHOLDER_COORDS = {
+    'atlanta': (33.749, -84.388),
+    'washington': (38.9072, -77.0369),
+    'montreal': (45.5017, -73.5673),
+    'minneapolis': (44.9778, -93.265),
+    'ottawa': (45.4215, -75.6972),
+    'austin': (30.2672, -97.7431),
+    'calgary': (51.0447, -114.0719),
+    'dallas': (32.7767, -96.797),
+    'honolulu': (21.3099, -157.8581),
+    'detroit': (42.3314, -83.0458),
+    'san-jose': (37.3382, -121.8863),
+    'new-orleans': (29.9511, -90.0715),
+    'nashville': (36.1627, -86.7816),
+    'edmonton': (53.5444, -113.4909),
+    'salt-lake-city': (40.7608, -111.891),
+    'baltimore': (39.2904, -76.6122),
+    'cleveland': (41.4993, -81.6944),
+    'tucson': (32.2226, -110.9747),
+    'pittsburgh': (40.4406, -79.9959),
+    'charlotte': (35.2271, -80.8431),
+    'tampa': (27.9506, -82.4572),
+    'richmond': (37.5407, -77.436),
+    'raleigh': (35.7796, -78.6382),
+    'rochester': (43.1566, -77.6088)
+}
+
+# Half the side length, in degrees, of a placeholder square
+PLACEHOLDER_HALF_SIZE = 0.05
+
 def create_placeholder_boundary(city_id, city_info, source_type):
     """Create placeholder boundaries for non-OSM sources"""
-    # These coordinates are approximate city centers for creating placeholder squares
-    city_coords = {
-        'atlanta': [33.749, -84.388],
-        'washington': [38.9072, -77.0369],
-        'montreal': [45.5017, -73.5673],
-        'minneapolis': [44.9778, -93.265],
-        'ottawa': [45.4215, -75.6972],
-        'austin': [30.2672, -97.7431],
-        'calgary': [51.0447, -114.0719],
-        'dallas': [32.7767, -96.797],
-        'honolulu': [21.3099, -157.8581],
-        'detroit': [42.3314, -83.0458],
-        'san-jose': [37.3382, -121.8863],
-        'new-orleans': [29.9511, -90.0715],
-        'nashville': [36.1627, -86.7816],
-        'edmonton': [53.5444, -113.4909],
-        'salt-lake-city': [40.7608, -111.891],
-        'baltimore': [39.2904, -76.6122],
-        'cleveland': [41.4993, -81.6944],
-        'tucson': [32.2226, -110.9747],
-        'pittsburgh': [40.4406, -79.9959],
-        'charlotte': [35.2271, -80.8431],
-        'tampa': [27.9506, -82.4572],
-        'richmond': [37.5407, -77.436],
-        'raleigh': [35.7796, -78.6382],
-        'rochester': [43.1566, -77.6088]
-    }
-    
-    if city_id not in city_coords:
+    if city_id not in PLACEHOLDER_COORDS:
         print(f"⚠️  {city_id}: No coordinates available for placeholder")
         return None
         
-    lat, lng = city_coords[city_id]
+    lat, lng = PLACEHOLDER_COORDS[city_id]
+    d = PLACEHOLDER_HALF_SIZE
     
     # Create a small square boundary as placeholder
     coords = [[[
-        [lng - 0.05, lat - 0.05],
-        [lng + 0.05, lat - 0.05], 
-        [lng + 0.05, lat + 0.05],
-        [lng - 0.05, lat + 0.05],
-        [lng - 0.05, lat - 0.05]
+        [lng - d, lat - d],
+        [lng + d, lat - d],
+        [lng + d, lat + d],
+        [lng - d, lat + d],
+        [lng - d, lat - d]
     ]]]
     
     feature_collection = {
@@ -224,8 +281,7 @@ def create_placeholder_boundary(city_id, city_info, source_type):
     }
     
     output_file = f"{city_id}.geojson"
-    with open(output_file, 'w') as f:
-        json.dump(feature_collection, f)
+    save_json(output_file, feature_collection, compact=True)
     
     print(f"📦 {city_id}: Created {source_type} placeholder boundary")
     return output_file
@@ -236,9 +292,10 @@ def main():
     print("=" * 60)
     
     # Separate cities by source type
-    osm_cities = {k: v for k, v in CITIES.items() if v['source'] == 'OSM'}
-    us_census_cities = {k: v for k, v in CITIES.items() if v['source'] == 'US_CENSUS'}
-    stats_canada_cities = {k: v for k, v in CITIES.items() if v['source'] == 'STATS_CANADA'}
+    osm_cities, us_census_cities, stats_canada_cities = {}, {}, {}
+    buckets = {'OSM': osm_cities, 'US_CENSUS': us_census_cities, 'STATS_CANADA': stats_canada_cities}
+    for k, v in CITIES.items():
+        buckets[v['source']][k] = v
     
     print(f"📊 Summary:")
     print(f"   • OSM cities: {len(osm_cities)}")
@@ -246,40 +303,53 @@ def main():
     print(f"   • Statistics Canada cities: {len(stats_canada_cities)}")
     print()
     
+    # One directory listing up front instead of a stat() per city in each loop below
+    existing = {name for name in os.listdir('.') if name.endswith('.geojson')}
+    
     # Process OSM cities (with rate limiting)
     print("🗺️  Downloading OSM boundaries...")
     successful_osm = 0
+    pending = []
     
     for i, (city_id, city_info) in enumerate(osm_cities.items(), 1):
         print(f"[{i:2d}/{len(osm_cities)}] {city_info['name']}, {city_info['country']}")
         
         # Skip if file already exists
-        if Path(f"{city_id}.geojson").exists():
+        if f"{city_id}.geojson" in existing:
             print(f"   ⏭️  Already exists, skipping")
             successful_osm += 1
             continue
         
-        # Download raw boundary data
-        raw_file = download_osm_boundary(city_id, city_info['osm_id'], delay=0.5)
-        if not raw_file:
-            continue
-            
-        # Convert to FeatureCollection format
-        final_file = convert_to_feature_collection(city_id, raw_file, city_info)
+        pending.append((city_id, city_info))
+    
+    # Downloads are network-bound, so overlap them: on an event loop when aiohttp is
+    # installed, otherwise across a few worker threads
+    if aiohttp is not None:
+        results = asyncio.run(process_osm_cities_async(pending))
+    else:
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            results = list(executor.map(lambda item: process_osm_city(*item), pending))
+    
+    for final_file in results:
         if final_file:
+            existing.add(final_file)
             successful_osm += 1
     
     # Create placeholders for US Census cities
     print(f"\n🇺🇸 Creating placeholders for US Census cities...")
     for city_id, city_info in us_census_cities.items():
-        if not Path(f"{city_id}.geojson").exists():
-            create_placeholder_boundary(city_id, city_info, 'US_CENSUS')
+        if f"{city_id}.geojson" not in existing:
+            output_file = create_placeholder_boundary(city_id, city_info, 'US_CENSUS')
+            if output_file:
+                existing.add(output_file)
     
     # Create placeholders for Statistics Canada cities  
     print(f"\n🇨🇦 Creating placeholders for Statistics Canada cities...")
     for city_id, city_info in stats_canada_cities.items():
-        if not Path(f"{city_id}.geojson").exists():
-            create_placeholder_boundary(city_id, city_info, 'STATS_CANADA')
+        if f"{city_id}.geojson" not in existing:
+            output_file = create_placeholder_boundary(city_id, city_info, 'STATS_CANADA')
+            if output_file:
+                existing.add(output_file)
     
     print(f"\n✅ Comprehensive download complete!")
     print(f"   • OSM boundaries: {successful_osm}/{len(osm_cities)} successful")
@@ -3,11 +3,13 @@
 Batch download and process Phase 4 city boundaries (cities 31-40)
 Based on city-boundary-sources.md reference file
 """
-import json
-import subprocess
-import os
+import requests
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from json_io import loads_json, save_json
+from rate_limit import wait_for_rate_limit
+
 # City configurations for Phase 4 (31-40, excluding Las Vegas #34)
 CITIES = {
     'oslo': {
@@ -63,34 +65,36 @@ CITIES = {
     }
 }
 
+# Shared across worker threads so connections to the OSM service are reused
+session = requests.Session()
+
+# Concurrent OSM downloads; the shared rate limiter still spaces out request starts
+MAX_WORKERS = 4
+REQUEST_INTERVAL = 0.5  # seconds between request starts across all workers
+
 def download_osm_boundary(city_id, osm_id):
     """Download boundary from OSM polygons service"""
     url = f"https://polygons.openstreetmap.fr/get_geojson.py?id={osm_id}&params=0"
-    filename = f"{city_id}-raw.json"
     
     try:
-        result = subprocess.run(['curl', '-L', '-s', url], 
-                              capture_output=True, text=True, check=True)
+        wait_for_rate_limit(REQUEST_INTERVAL)
+        
+        response = session.get(url, timeout=30)
+        response.raise_for_status()
         
         # Validate JSON
-        data = json.loads(result.stdout)
+        data = loads_json(response.content)
         
-        with open(filename, 'w') as f:
-            json.dump(data, f)
-            
-        print(f"✅ {city_id}: Downloaded {len(result.stdout)} chars")
-        return filename
+        print(f"✅ {city_id}: Downloaded {len(response.content)} bytes")
+        return data
         
-    except (subprocess.CalledProcessError, json.JSONDecodeError, Exception) as e:
+    except (requests.RequestException, ValueError, Exception) as e:
         print(f"❌ {city_id}: Failed - {e}")
         return None
 
-def convert_to_feature_collection(city_id, raw_file, city_info):
-    """Convert raw OSM data to proper FeatureCollection"""
+def convert_to_feature_collection(city_id, raw_data, city_info):
+    """Convert downloaded OSM geometry to proper FeatureCollection"""
     try:
-        with open(raw_file, 'r') as f:
-            raw_data = json.load(f)
-        
         # Create feature with proper metadata
         feature = {
             'type': 'Feature',
@@ -110,11 +114,7 @@ def convert_to_feature_collection(city_id, raw_file, city_info):
         
         # Write final boundary file
         output_file = f"{city_id}.geojson"
-        with open(output_file, 'w') as f:
-            json.dump(feature_collection, f)
-        
-        # Clean up raw file
-        os.remove(raw_file)
+        save_json(output_file, feature_collection, compact=True)
         
         size = Path(output_file).stat().st_size
         print(f"✅ {city_id}: Processed to FeatureCollection ({size:,} bytes)")
@@ -124,6 +124,21 @@ def convert_to_feature_collection(city_id, raw_file, city_info):
         print(f"❌ {city_id}: Conversion failed - {e}")
         return None
 
+def process_osm_city(city_id, city_info):
+    """Download one OSM boundary and convert it to a FeatureCollection"""
+    print(f"\n📍 Processing {city_info['name']}, {city_info['country']}")
+    
+    # Download raw boundary data
+    raw_data = download_osm_boundary(city_id, city_info['osm_id'])
+    if raw_data is None:
+        return None
+        
+    # Convert to FeatureCollection format
+    final_file = convert_to_feature_collection(city_id, raw_data, city_info)
+    if final_file:
+        print(f"   → {final_file}")
+    return final_file
+
 def main():
     """Process all Phase 4 OSM cities"""
     print("🌍 Phase 4: Downloading city boundaries (31-40)")
@@ -131,18 +146,9 @@ def main():
     
     osm_cities = {k: v for k, v in CITIES.items() if v['source'] == 'OSM'}
     
-    for city_id, city_info in osm_cities.items():
-        print(f"\n📍 Processing {city_info['name']}, {city_info['country']}")
-        
-        # Download raw boundary data
-        raw_file = download_osm_boundary(city_id, city_info['osm_id'])
-        if not raw_file:
-            continue
-            
-        # Convert to FeatureCollection format
-        final_file = convert_to_feature_collection(city_id, raw_file, city_info)
-        if final_file:
-            print(f"   → {final_file}")
+    # Downloads are network-bound, so overlap them across a few worker threads
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        list(executor.map(lambda item: process_osm_city(*item), osm_cities.items()))
     
     print(f"\n✅ Phase 4 OSM downloads complete!")
     print(f"⚠️  Still need: Atlanta, Washington (US Census), Montreal (Stats Canada)")
@@ -3,17 +3,122 @@
 Boundary Validation Rules
 Comprehensive quality gates for city boundary and statistics validation
 """
+import bisect
+from array import array
 import json
 import math
 import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from enum import IntFlag, auto
+from itertools import chain
+from operator import itemgetter
 from typing import Dict, List, Optional, Tuple, Any
 
+class Gate(IntFlag):
+    """Quality gates, declared in the order the validators evaluate them"""
+    DENSITY_MAXIMUM = auto()
+    DENSITY_MINIMUM = auto()
+    AREA_TOO_SMALL = auto()
+    AREA_POPULATION_MATCH = auto()
+    AREA_TOO_LARGE = auto()
+    AREA_MAXIMUM = auto()
+    AREA_MINIMUM = auto()
+    RATIO_TOO_DENSE = auto()
+    RATIO_TOO_SPARSE = auto()
+    POPULATION_AREA_RATIO = auto()
+    REASONABLE_SHAPE = auto()
+    REASONABLE_COMPLEXITY = auto()
+
+_GATE_NAMES = [(gate, gate.name.lower()) for gate in Gate]
+
+def gate_names(mask: Gate) -> List[str]:
+    """Expand a gate bitmask into gate names, in evaluation order"""
+    return [name for gate, name in _GATE_NAMES if gate & mask]
+
+def pack_ring(ring: List[List[float]]) -> array:
+    """
+    Pack a [[lon, lat], ...] ring into one contiguous float32 array of interleaved lon/lat values,
+    about a seventh of the nested lists' footprint. Single precision is far finer than the
+    degree-scale extents the geographic gate measures, so packed and nested rings validate alike.
+    """
+    return array('f', chain.from_iterable(ring))
+
+def ring_point_count(ring) -> int:
+    """Number of points in a nested or packed ring"""
+    if isinstance(ring, array):
+        return len(ring) // 2
+    return len(ring)
+
+# Density and area thresholds as named fields; see setup_validation_thresholds for their meaning
+Thresholds = namedtuple('Thresholds', [
+    'max_plausible_density', 'min_plausible_density', 'very_high_density', 'high_density_warning',
+    'low_density_warning', 'very_low_density', 'excellent_density_min', 'excellent_density_max',
+    'good_density_min', 'good_density_max',
+    'mega_city_min_area', 'large_city_min_area', 'medium_city_min_area', 'small_city_min_area',
+    'max_city_area', 'min_city_area', 'suspiciously_large', 'suspiciously_small'
+])
+
+@dataclass(slots=True)
+class GateResult:
+    """Outcome of one validation gate: gate bitmasks plus (code, *args) issues and warnings"""
+    passed: Gate = Gate(0)
+    failed: Gate = Gate(0)
+    issues: List[Tuple] = field(default_factory=list)
+    warnings: List[Tuple] = field(default_factory=list)
+
+# Issue and warning templates, keyed by the code the validators record; formatted on demand
+_MESSAGES = {
+    'density_max_exceeded': "Implausibly high density: {:,.0f}/km² exceeds global maximum ({:,}/km²). "
+                            "Likely wrong boundary - may be capturing only downtown core.",
+    'density_min_exceeded': "Implausibly low density: {:,.1f}/km² below urban minimum ({:,}/km²). "
+                            "Likely wrong boundary - may be capturing entire metropolitan region.",
+    'very_high_density': "Very high density ({:,.0f}/km²) - verify this is city proper, not just downtown district",
+    'high_density': "High density ({:,.0f}/km²) - typical of very dense urban cores",
+    'low_density': "Low density ({:,.0f}/km²) - verify boundary isn't too large (including suburbs/metro area)",
+    'very_low_density': "Very low density ({:,.0f}/km²) - may include non-urban areas",
+    'area_too_small': "Area too small for {}: {:.1f}km² is below minimum expected {}km² for {:,} people. "
+                      "Boundary may be incomplete or incorrectly drawn.",
+    'area_too_large': "Area suspiciously large: {:,.0f}km² exceeds typical city limits. "
+                      "May be capturing metropolitan area instead of city proper.",
+    'very_small_area': "Very small area ({:.1f}km²) - acceptable for city-states/micro-cities",
+    'large_area': "Large area ({:,.0f}km²) - verify this is city proper boundary",
+    'small_area': "Small area ({:.1f}km²) - verify boundary is complete",
+    'zero_population': "Zero population - cannot calculate area ratio",
+    'ratio_too_dense': "Population-area ratio too high for {}: {:.1f}km² per 100k people is below expected range "
+                       "({}-{}km²). Boundary may be too small.",
+    'ratio_too_sparse': "Population-area ratio too low for {}: {:.1f}km² per 100k people exceeds expected range "
+                        "({}-{}km²). Boundary may include suburbs/metro area.",
+    'no_coordinates': "No coordinate data for geographic validation",
+    'very_elongated': "Very elongated boundary (ratio {:.1f}:1) - verify this represents actual city limits",
+    'elongated': "Elongated boundary (ratio {:.1f}:1) - may be appropriate for river/coastal cities",
+    'very_simple': "Very simple boundary ({} points) - may lack detail",
+    'very_complex': "Very complex boundary ({} points) - unusually detailed",
+}
+
+# Each template's str.format bound once, so rendering is a single C call per message
+_FORMATTERS = {code: template.format for code, template in _MESSAGES.items()}
+
+def format_message(message) -> str:
+    """Render an issue or warning; (code, *args) tuples are formatted, plain strings pass through"""
+    if isinstance(message, str):
+        return message
+    return _FORMATTERS[message[0]](*message[1:])
+
 class BoundaryValidationRules:
     """
     Comprehensive validation rules for city boundary data quality
     """
     
+    # Rings whose bounding box is remembered between validations of the same boundary
+    BBOX_CACHE_SIZE = 128
+    
+    # Batches smaller than this are screened in-process; worker start-up would dominate
+    PARALLEL_MIN_CASES = 5000
+    
     def __init__(self):
+        self._bbox_cache = {}
         self.setup_validation_thresholds()
         self.setup_reference_cities()
         self.setup_geographic_constraints()
@@ -66,6 +171,30 @@ class BoundaryValidationRules:
             'small_city_area_per_100k': (10, 500),  # 10-100k: 100-5000km² per 100k
         }
         
+        # Frozen attribute view of the density and area thresholds for the gate checks
+        self._t = Thresholds(**self.density_thresholds, **self.area_thresholds)
+        
+        # Population bands shared by the area and ratio checks (0=small .. 3=mega), found with bisect
+        # on the lower population bound of the medium/large/mega bands. The per-band thresholds are
+        # flattened into tuples indexed by band so the gates skip the string-keyed dict lookups.
+        self._pop_breaks = [100000, 1000000, 10000000]
+        sizes = ('small', 'medium', 'large', 'mega')
+        self._band_names = tuple(f"{size} city" for size in sizes)
+        self._min_area_by_band = tuple(self.area_thresholds[f"{size}_city_min_area"] for size in sizes)
+        self._ratio_min_by_band = tuple(self.ratio_thresholds[f"{size}_city_area_per_100k"][0] for size in sizes)
+        self._ratio_max_by_band = tuple(self.ratio_thresholds[f"{size}_city_area_per_100k"][1] for size in sizes)
+        
+        # Every hard-gate threshold packed together for the batch kernel in _hard_gate_failures
+        self._numeric_thresholds = (
+            self._t.max_plausible_density,
+            self._t.min_plausible_density,
+            self._t.max_city_area,
+            self._pop_breaks,
+            self._min_area_by_band,
+            self._ratio_min_by_band,
+            self._ratio_max_by_band,
+        )
+        
     def setup_reference_cities(self):
         """Define reference cities for validation benchmarks"""
         
@@ -99,6 +228,14 @@ class BoundaryValidationRules:
             ],
         }
         
+        # Flattened column view of every benchmark for lookups across all tiers at once
+        rows = [(tier, ref) for tier, refs in self.reference_benchmarks.items() for ref in refs]
+        self._ref_tier = [tier for tier, _ in rows]
+        self._ref_name = [ref['name'] for _, ref in rows]
+        self._ref_density = [ref['density'] for _, ref in rows]
+        self._ref_area = [ref['area'] for _, ref in rows]
+        self._ref_pop = [ref['pop'] for _, ref in rows]
+        
     def setup_geographic_constraints(self):
         """Define geographic constraints that affect city shape/size"""
         
@@ -122,10 +259,40 @@ class BoundaryValidationRules:
             'desert_density_bonus': 1.3,         # Slightly higher density expected
         }
         
+        # Shape and complexity bins for the geographic gate: bisect picks the warning code,
+        # None means the gate passes
+        self._aspect_bins = (15, 25)            # bisect_left: ratio > 15 elongated, > 25 very elongated
+        self._aspect_warnings = (None, 'elongated', 'very_elongated')
+        self._complexity_bins = (10, 5001)      # bisect_right on integer point counts: < 10, 10-5000, > 5000
+        self._complexity_warnings = ('very_simple', None, 'very_complex')
+        
+    def _band(self, population: int) -> int:
+        """Return the population band index (0=small, 1=medium, 2=large, 3=mega) of a city"""
+        return bisect.bisect_right(self._pop_breaks, population)
+        
+    def nearest_reference(self, density: float) -> Dict[str, Any]:
+        """Return the benchmark city whose density is closest to `density`, with its tier"""
+        ref_density = self._ref_density
+        i = min(range(len(ref_density)), key=lambda k: abs(ref_density[k] - density))
+        return {
+            'name': self._ref_name[i],
+            'density': ref_density[i],
+            'area': self._ref_area[i],
+            'pop': self._ref_pop[i],
+            'tier': self._ref_tier[i]
+        }
+        
     def validate_boundary_quality(self, city_data: Dict, boundary_area_km2: float, 
-                                 coordinates: List[List[float]]) -> Dict[str, Any]:
+                                 coordinates: List[List[float]], format_messages: bool = True,
+                                 fast_reject: bool = False) -> Dict[str, Any]:
         """
         Comprehensive boundary validation returning detailed quality assessment
+        With format_messages=False, issues and warnings stay as (code, *args) tuples for callers
+        that only need the score; get_validation_summary formats them when rendering
+        With fast_reject=True, a boundary failing the density gate is rejected without running the
+        area, ratio and geographic gates, so their issues and warnings are not reported
+        The outer ring in coordinates may be packed with pack_ring once by callers that keep
+        boundaries resident and revalidate them
         """
         
         validation_result = {
@@ -149,45 +316,64 @@ class BoundaryValidationRules:
                 validation_result['issues'].append("Missing population or area data")
                 return validation_result
                 
+            # Both ratios and the population band are derived once here and shared by the gates
             calculated_density = population / boundary_area_km2
+            area_per_100k = (boundary_area_km2 * 100000) / population
+            band = self._band(population)
+            aspect_ratio = self.calculate_aspect_ratio(coordinates)
+            point_count = ring_point_count(coordinates[0]) if coordinates else 0
             validation_result['metrics'] = {
                 'calculated_density': calculated_density,
                 'boundary_area_km2': boundary_area_km2,
                 'population': population,
-                'aspect_ratio': self.calculate_aspect_ratio(coordinates),
-                'geometric_complexity': len(coordinates[0]) if coordinates else 0
+                'aspect_ratio': aspect_ratio,
+                'geometric_complexity': point_count
             }
             
+            # Gates accumulate as bitmasks and are expanded to names once at the end
+            passed = failed = Gate(0)
+            
             # Gate 1: Density Sanity Check
             density_result = self.validate_population_density(calculated_density)
-            validation_result['passed_gates'].extend(density_result['passed'])
-            validation_result['failed_gates'].extend(density_result['failed'])
-            validation_result['issues'].extend(density_result['issues'])
-            validation_result['warnings'].extend(density_result['warnings'])
+            passed |= density_result.passed
+            failed |= density_result.failed
+            validation_result['issues'].extend(density_result.issues)
+            validation_result['warnings'].extend(density_result.warnings)
+            
+            # A density hard-fail rejects the boundary whatever the remaining gates find,
+            # so with fast_reject they are skipped and count as empty results
+            skip_remaining = fast_reject and bool(density_result.failed)
             
             # Gate 2: Area Reasonableness  
-            area_result = self.validate_area_reasonableness(boundary_area_km2, population)
-            validation_result['passed_gates'].extend(area_result['passed'])
-            validation_result['failed_gates'].extend(area_result['failed'])
-            validation_result['issues'].extend(area_result['issues'])
-            validation_result['warnings'].extend(area_result['warnings'])
+            area_result = (GateResult() if skip_remaining else
+                           self.validate_area_reasonableness(boundary_area_km2, population, band=band))
+            passed |= area_result.passed
+            failed |= area_result.failed
+            validation_result['issues'].extend(area_result.issues)
+            validation_result['warnings'].extend(area_result.warnings)
             
             # Gate 3: Population-Area Ratio Cross-validation
-            ratio_result = self.validate_population_area_ratio(population, boundary_area_km2)
-            validation_result['passed_gates'].extend(ratio_result['passed'])
-            validation_result['failed_gates'].extend(ratio_result['failed'])
-            validation_result['issues'].extend(ratio_result['issues'])
-            validation_result['warnings'].extend(ratio_result['warnings'])
+            ratio_result = (GateResult() if skip_remaining else
+                            self.validate_population_area_ratio(population, boundary_area_km2,
+                                                                area_per_100k=area_per_100k, band=band))
+            passed |= ratio_result.passed
+            failed |= ratio_result.failed
+            validation_result['issues'].extend(ratio_result.issues)
+            validation_result['warnings'].extend(ratio_result.warnings)
             
             # Gate 4: Geographic Plausibility
-            geo_result = self.validate_geographic_plausibility(coordinates, country)
-            validation_result['passed_gates'].extend(geo_result['passed'])
-            validation_result['failed_gates'].extend(geo_result['failed'])
-            validation_result['warnings'].extend(geo_result['warnings'])
-            
-            # Calculate overall quality
-            validation_result['validation_score'] = self.calculate_quality_score(
-                density_result, area_result, ratio_result, geo_result
+            geo_result = (GateResult() if skip_remaining else
+                          self.validate_geographic_plausibility(coordinates, country, aspect_ratio=aspect_ratio,
+                                                                point_count=point_count))
+            passed |= geo_result.passed
+            failed |= geo_result.failed
+            validation_result['warnings'].extend(geo_result.warnings)
+            validation_result['passed_gates'] = gate_names(passed)
+            validation_result['failed_gates'] = gate_names(failed)
+            
+            # Calculate overall quality from the merged masks and warnings; no per-gate rescan
+            validation_result['validation_score'] = self.score_from_counts(
+                failed.bit_count(), len(validation_result['warnings']), passed.bit_count()
             )
             
             # Determine overall quality rating
@@ -212,240 +398,313 @@ class BoundaryValidationRules:
             validation_result['issues'].append(f"Validation error: {str(e)}")
             validation_result['overall_quality'] = 'error'
             
+        if format_messages:
+            validation_result['issues'] = list(map(format_message, validation_result['issues']))
+            validation_result['warnings'] = list(map(format_message, validation_result['warnings']))
+            
         return validation_result
         
-    def validate_population_density(self, density: float) -> Dict[str, List[str]]:
+    def validate_many(self, cases: List[Tuple[Dict, float, List[List[float]]]],
+                      n_jobs: int = -1) -> List[Dict[str, List[str]]]:
+        """
+        Screen many boundaries against the hard-rejection gates at once
+        Takes the same (city_data, boundary_area_km2, coordinates) cases as validate_boundary_quality
+        and returns each case's 'failed_gates' and 'issues' as the full validation would report them.
+        Large batches are split into chunks across n_jobs worker processes; negative values count
+        back from the number of cores (-1 for all cores, -2 for all but one), and 0 is rejected
+        """
+        
+        if n_jobs == 0:
+            raise ValueError('n_jobs must be a positive worker count or a negative offset from the core count')
+        workers = max(1, (os.cpu_count() or 1) + 1 + n_jobs) if n_jobs < 0 else n_jobs
+        
+        if workers > 1 and len(cases) >= self.PARALLEL_MIN_CASES:
+            return self._validate_many_parallel(cases, workers)
+        
+        populations = [city_data.get('population_city', 0) for city_data, _, _ in cases]
+        areas = [area for _, area, _ in cases]
+        masks = self._hard_gate_failures(populations, areas)
+        
+        # Only the failing cases go through the per-gate validators to build their messages
+        results = []
+        for population, area, mask in zip(populations, areas, masks):
+            if population == 0 or area == 0:
+                results.append({'failed_gates': [], 'issues': ["Missing population or area data"]})
+                continue
+            if not mask:
+                results.append({'failed_gates': [], 'issues': []})
+                continue
+                
+            issues = []
+            for gate_result in (self.validate_population_density(population / area),
+                                self.validate_area_reasonableness(area, population),
+                                self.validate_population_area_ratio(population, area)):
+                issues.extend(gate_result.issues)
+            results.append({'failed_gates': gate_names(mask), 'issues': list(map(format_message, issues))})
+            
+        return results
+        
+    def _validate_many_parallel(self, cases: List[Tuple[Dict, float, List[List[float]]]],
+                                workers: int) -> List[Dict[str, List[str]]]:
+        """Run validate_many over chunks of the cases in worker processes, keeping input order"""
+        # A few chunks per worker balances the load without paying per-case pickling;
+        # the screening gates never look at the coordinates, so they are not shipped to the workers
+        chunk_size = max(1, -(-len(cases) // (workers * 4)))
+        chunks = [[(city_data, area, None) for city_data, area, _ in cases[start:start + chunk_size]]
+                  for start in range(0, len(cases), chunk_size)]
+        
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = []
+            for chunk_results in executor.map(self.validate_many, chunks, [1] * len(chunks)):
+                results.extend(chunk_results)
+            return results
+        
+    def __getstate__(self) -> Dict:
+        """Pickle without the bbox cache so worker processes receive only the thresholds"""
+        state = self.__dict__.copy()
+        state['_bbox_cache'] = {}
+        return state
+        
+    def _hard_gate_failures(self, populations: List[int], areas: List[float]) -> List[int]:
+        """
+        Return the failed hard-gate bitmask of each (population, area) pair in one fused pass,
+        with every threshold bound to a local; pairs with zero population or area get 0
+        """
+        (max_density, min_density, max_area, pop_breaks,
+         min_area_by_band, ratio_min_by_band, ratio_max_by_band) = self._numeric_thresholds
+        band_of = bisect.bisect_right
+        density_maximum, density_minimum = int(Gate.DENSITY_MAXIMUM), int(Gate.DENSITY_MINIMUM)
+        area_too_small, area_too_large = int(Gate.AREA_TOO_SMALL), int(Gate.AREA_TOO_LARGE)
+        ratio_too_dense, ratio_too_sparse = int(Gate.RATIO_TOO_DENSE), int(Gate.RATIO_TOO_SPARSE)
+        
+        masks = []
+        for population, area in zip(populations, areas):
+            if population == 0 or area == 0:
+                masks.append(0)
+                continue
+                
+            density = population / area
+            band = band_of(pop_breaks, population)
+            area_per_100k = (area * 100000) / population
+            mask = 0
+            if density > max_density:
+                mask |= density_maximum
+            if density < min_density:
+                mask |= density_minimum
+            if area < min_area_by_band[band]:
+                mask |= area_too_small
+            if area > max_area:
+                mask |= area_too_large
+            if area_per_100k < ratio_min_by_band[band]:
+                mask |= ratio_too_dense
+            elif area_per_100k > ratio_max_by_band[band]:
+                mask |= ratio_too_sparse
+            masks.append(mask)
+            
+        return masks
+        
+    def validate_population_density(self, density: float) -> GateResult:
         """Validate population density against global urban planning norms"""
         
-        result = {'passed': [], 'failed': [], 'issues': [], 'warnings': []}
+        result = GateResult()
+        t = self._t
         
         # Critical density checks (hard rejection)
-        if density > self.density_thresholds['max_plausible_density']:
-            result['failed'].append('density_maximum')
-            result['issues'].append(
-                f"Implausibly high density: {density:,.0f}/km² exceeds global maximum "
-                f"({self.density_thresholds['max_plausible_density']:,}/km²). "
-                f"Likely wrong boundary - may be capturing only downtown core."
+        if density > t.max_plausible_density:
+            result.failed |= Gate.DENSITY_MAXIMUM
+            result.issues.append(
+                ('density_max_exceeded', density, t.max_plausible_density)
             )
         else:
-            result['passed'].append('density_maximum')
-            
-        if density < self.density_thresholds['min_plausible_density']:
-            result['failed'].append('density_minimum') 
-            result['issues'].append(
-                f"Implausibly low density: {density:,.1f}/km² below urban minimum "
-                f"({self.density_thresholds['min_plausible_density']:,}/km²). "
-                f"Likely wrong boundary - may be capturing entire metropolitan region."
+            result.passed |= Gate.DENSITY_MAXIMUM
+            
+        if density < t.min_plausible_density:
+            result.failed |= Gate.DENSITY_MINIMUM
+            result.issues.append(
+                ('density_min_exceeded', density, t.min_plausible_density)
             )
         else:
-            result['passed'].append('density_minimum')
+            result.passed |= Gate.DENSITY_MINIMUM
             
         # Warning thresholds
-        if density > self.density_thresholds['very_high_density']:
-            result['warnings'].append(
-                f"Very high density ({density:,.0f}/km²) - verify this is city proper, "
-                f"not just downtown district"
-            )
-        elif density > self.density_thresholds['high_density_warning']:
-            result['warnings'].append(
-                f"High density ({density:,.0f}/km²) - typical of very dense urban cores"
-            )
+        if density > t.very_high_density:
+            result.warnings.append(('very_high_density', density))
+        elif density > t.high_density_warning:
+            result.warnings.append(('high_density', density))
             
-        if density < self.density_thresholds['low_density_warning']:
-            result['warnings'].append(
-                f"Low density ({density:,.0f}/km²) - verify boundary isn't too large "
-                f"(including suburbs/metro area)"
-            )
-        elif density < self.density_thresholds['very_low_density']:
-            result['warnings'].append(
-                f"Very low density ({density:,.0f}/km²) - may include non-urban areas"
-            )
+        if density < t.low_density_warning:
+            result.warnings.append(('low_density', density))
+        elif density < t.very_low_density:
+            result.warnings.append(('very_low_density', density))
             
         return result
         
-    def validate_area_reasonableness(self, area: float, population: int) -> Dict[str, List[str]]:
-        """Validate area size against population expectations"""
+    def validate_area_reasonableness(self, area: float, population: int,
+                                     band: Optional[int] = None) -> GateResult:
+        """Validate area size against population expectations; pass the population band if already computed"""
         
-        result = {'passed': [], 'failed': [], 'issues': [], 'warnings': []}
+        result = GateResult()
+        t = self._t
         
         # Population-based area expectations
-        if population >= 10000000:  # Mega city
-            min_expected = self.area_thresholds['mega_city_min_area']
-            category = "mega city"
-        elif population >= 1000000:  # Large city  
-            min_expected = self.area_thresholds['large_city_min_area']
-            category = "large city"
-        elif population >= 100000:  # Medium city
-            min_expected = self.area_thresholds['medium_city_min_area'] 
-            category = "medium city"
-        else:  # Small city
-            min_expected = self.area_thresholds['small_city_min_area']
-            category = "small city"
+        if band is None:
+            band = self._band(population)
+        category = self._band_names[band]
+        min_expected = self._min_area_by_band[band]
             
         # Check minimum area for population
         if area < min_expected:
-            result['failed'].append('area_too_small')
-            result['issues'].append(
-                f"Area too small for {category}: {area:.1f}km² is below minimum "
-                f"expected {min_expected}km² for {population:,} people. "
-                f"Boundary may be incomplete or incorrectly drawn."
-            )
+            result.failed |= Gate.AREA_TOO_SMALL
+            result.issues.append(('area_too_small', category, area, min_expected, population))
         else:
-            result['passed'].append('area_population_match')
+            result.passed |= Gate.AREA_POPULATION_MATCH
             
         # Check absolute area limits
-        if area > self.area_thresholds['max_city_area']:
-            result['failed'].append('area_too_large')
-            result['issues'].append(
-                f"Area suspiciously large: {area:,.0f}km² exceeds typical city limits. "
-                f"May be capturing metropolitan area instead of city proper."
-            )
+        if area > t.max_city_area:
+            result.failed |= Gate.AREA_TOO_LARGE
+            result.issues.append(('area_too_large', area))
         else:
-            result['passed'].append('area_maximum')
+            result.passed |= Gate.AREA_MAXIMUM
             
-        if area < self.area_thresholds['min_city_area']:
+        if area < t.min_city_area:
             # Allow very small areas for special cases (Monaco, Vatican, etc.)
-            result['warnings'].append(
-                f"Very small area ({area:.1f}km²) - acceptable for city-states/micro-cities"
-            )
+            result.warnings.append(('very_small_area', area))
         else:
-            result['passed'].append('area_minimum')
+            result.passed |= Gate.AREA_MINIMUM
             
         # Warning thresholds
-        if area > self.area_thresholds['suspiciously_large']:
-            result['warnings'].append(
-                f"Large area ({area:,.0f}km²) - verify this is city proper boundary"
-            )
-        elif area < self.area_thresholds['suspiciously_small']:
-            result['warnings'].append(
-                f"Small area ({area:.1f}km²) - verify boundary is complete"
-            )
+        if area > t.suspiciously_large:
+            result.warnings.append(('large_area', area))
+        elif area < t.suspiciously_small:
+            result.warnings.append(('small_area', area))
             
         return result
         
-    def validate_population_area_ratio(self, population: int, area: float) -> Dict[str, List[str]]:
-        """Cross-validate population vs area using global urban patterns"""
+    def validate_population_area_ratio(self, population: int, area: float, area_per_100k: Optional[float] = None,
+                                       band: Optional[int] = None) -> GateResult:
+        """Cross-validate population vs area using global urban patterns; pass the ratio and band if already computed"""
         
-        result = {'passed': [], 'failed': [], 'issues': [], 'warnings': []}
+        result = GateResult()
         
         if population == 0:
-            result['issues'].append("Zero population - cannot calculate area ratio")
+            result.issues.append(('zero_population',))
             return result
             
-        area_per_100k = (area * 100000) / population
+        if area_per_100k is None:
+            area_per_100k = (area * 100000) / population
         
         # Determine expected range based on city size
-        if population >= 10000000:
-            expected_range = self.ratio_thresholds['mega_city_area_per_100k']
-            category = "mega city"
-        elif population >= 1000000:
-            expected_range = self.ratio_thresholds['large_city_area_per_100k']
-            category = "large city"
-        elif population >= 100000:
-            expected_range = self.ratio_thresholds['medium_city_area_per_100k']
-            category = "medium city"
-        else:
-            expected_range = self.ratio_thresholds['small_city_area_per_100k']
-            category = "small city"
-            
-        min_expected, max_expected = expected_range
+        if band is None:
+            band = self._band(population)
+        category = self._band_names[band]
+        min_expected = self._ratio_min_by_band[band]
+        max_expected = self._ratio_max_by_band[band]
         
         if area_per_100k < min_expected:
-            result['failed'].append('ratio_too_dense')
-            result['issues'].append(
-                f"Population-area ratio too high for {category}: "
-                f"{area_per_100k:.1f}km² per 100k people is below expected range "
-                f"({min_expected}-{max_expected}km²). Boundary may be too small."
-            )
+            result.failed |= Gate.RATIO_TOO_DENSE
+            result.issues.append(('ratio_too_dense', category, area_per_100k, min_expected, max_expected))
         elif area_per_100k > max_expected:
-            result['failed'].append('ratio_too_sparse')
-            result['issues'].append(
-                f"Population-area ratio too low for {category}: "
-                f"{area_per_100k:.1f}km² per 100k people exceeds expected range "
-                f"({min_expected}-{max_expected}km²). Boundary may include suburbs/metro area."
-            )
+            result.failed |= Gate.RATIO_TOO_SPARSE
+            result.issues.append(('ratio_too_sparse', category, area_per_100k, min_expected, max_expected))
         else:
-            result['passed'].append('population_area_ratio')
+            result.passed |= Gate.POPULATION_AREA_RATIO
             
         return result
         
     def validate_geographic_plausibility(self, coordinates: List[List[float]], 
-                                        country: str) -> Dict[str, List[str]]:
-        """Validate geographic shape and constraints"""
+                                        country: str, aspect_ratio: Optional[float] = None,
+                                        point_count: Optional[int] = None) -> GateResult:
+        """Validate geographic shape and constraints; pass aspect_ratio and point_count if already computed"""
         
-        result = {'passed': [], 'failed': [], 'issues': [], 'warnings': []}
+        result = GateResult()
         
         if not coordinates:
-            result['warnings'].append("No coordinate data for geographic validation")
+            result.warnings.append(('no_coordinates',))
             return result
             
-        # Calculate aspect ratio
-        aspect_ratio = self.calculate_aspect_ratio(coordinates)
+        # Calculate aspect ratio unless the caller already has it
+        if aspect_ratio is None:
+            aspect_ratio = self.calculate_aspect_ratio(coordinates)
         
         # Basic shape validation
-        if aspect_ratio > 25:  # Extremely elongated
-            result['warnings'].append(
-                f"Very elongated boundary (ratio {aspect_ratio:.1f}:1) - "
-                f"verify this represents actual city limits"
-            )
-        elif aspect_ratio > 15:
-            result['warnings'].append(
-                f"Elongated boundary (ratio {aspect_ratio:.1f}:1) - "
-                f"may be appropriate for river/coastal cities"
-            )
+        code = self._aspect_warnings[bisect.bisect_left(self._aspect_bins, aspect_ratio)]
+        if code:
+            result.warnings.append((code, aspect_ratio))
         else:
-            result['passed'].append('reasonable_shape')
+            result.passed |= Gate.REASONABLE_SHAPE
             
         # Complexity check
-        point_count = len(coordinates[0]) if coordinates else 0
-        if point_count < 10:
-            result['warnings'].append(
-                f"Very simple boundary ({point_count} points) - may lack detail"
-            )
-        elif point_count > 5000:
-            result['warnings'].append(
-                f"Very complex boundary ({point_count} points) - unusually detailed"
-            )
+        if point_count is None:
+            point_count = ring_point_count(coordinates[0])
+        code = self._complexity_warnings[bisect.bisect_right(self._complexity_bins, point_count)]
+        if code:
+            result.warnings.append((code, point_count))
         else:
-            result['passed'].append('reasonable_complexity')
+            result.passed |= Gate.REASONABLE_COMPLEXITY
             
         return result
         
     def calculate_aspect_ratio(self, coordinates: List[List[float]]) -> float:
-        """Calculate length/width aspect ratio of boundary"""
+        """Calculate length/width aspect ratio of boundary; the ring may be nested or packed with pack_ring"""
         
-        if not coordinates or len(coordinates[0]) < 3:
+        if not coordinates or ring_point_count(coordinates[0]) < 3:
             return 1.0
             
-        coords = coordinates[0]
-        lons = [c[0] for c in coords]
-        lats = [c[1] for c in coords]
-        
-        width = max(lons) - min(lons)
-        height = max(lats) - min(lats)
+        min_lon, max_lon, min_lat, max_lat, _ = self._ring_bbox(coordinates[0])
+        width = max_lon - min_lon
+        height = max_lat - min_lat
         
         if height == 0 or width == 0:
             return 1.0  # Default to square if no variation
             
         return max(width, height) / min(width, height)
         
-    def calculate_quality_score(self, density_result: Dict, area_result: Dict,
-                              ratio_result: Dict, geo_result: Dict) -> float:
+    def _ring_bbox(self, ring) -> Tuple[float, float, float, float, int]:
+        """
+        Return (min_lon, max_lon, min_lat, max_lat, point_count) of a ring, cached by identity
+        so revalidating the same boundary skips the coordinate scan. The cache holds a reference
+        to each ring, so a cached id cannot be reused; rings must not be mutated in place.
+        """
+        cached = self._bbox_cache.get(id(ring))
+        if cached is not None and cached[0] is ring:
+            return cached[1]
+            
+        # Split into lon/lat columns in C, then reduce each column with builtins;
+        # a packed ring is already contiguous, so strided slices give the columns directly
+        if isinstance(ring, array):
+            lons = ring[0::2]
+            lats = ring[1::2]
+        else:
+            lons = list(map(itemgetter(0), ring))
+            lats = list(map(itemgetter(1), ring))
+        bbox = (min(lons), max(lons), min(lats), max(lats), len(lons))
+        
+        if len(self._bbox_cache) >= self.BBOX_CACHE_SIZE:
+            # Evict the oldest entry; dicts keep insertion order
+            del self._bbox_cache[next(iter(self._bbox_cache))]
+        self._bbox_cache[id(ring)] = (ring, bbox)
+        return bbox
+        
+    def calculate_quality_score(self, density_result: GateResult, area_result: GateResult,
+                              ratio_result: GateResult, geo_result: GateResult) -> float:
         """Calculate overall quality score (0-100)"""
         
-        score = 100.0
+        # Each gate belongs to a single validator, so the OR of the masks has one bit per outcome
+        total_failures = (density_result.failed | area_result.failed |
+                          ratio_result.failed | geo_result.failed).bit_count()
+        total_warnings = (len(density_result.warnings) + len(area_result.warnings) +
+                          len(ratio_result.warnings) + len(geo_result.warnings))
+        total_passed = (density_result.passed | area_result.passed |
+                        ratio_result.passed | geo_result.passed).bit_count()
+        return self.score_from_counts(total_failures, total_warnings, total_passed)
         
-        # Deduct points for failures (critical issues)
-        total_failures = sum(len(r['failed']) for r in [density_result, area_result, ratio_result, geo_result])
-        score -= total_failures * 30  # 30 points per critical failure
+    def score_from_counts(self, total_failures: int, total_warnings: int, total_passed: int) -> float:
+        """Quality score (0-100) from the number of failed gates, warnings and passed gates"""
         
-        # Deduct points for warnings
-        total_warnings = sum(len(r['warnings']) for r in [density_result, area_result, ratio_result, geo_result])
+        score = 100.0
+        score -= total_failures * 30  # 30 points per critical failure
         score -= total_warnings * 5   # 5 points per warning
-        
-        # Bonus points for passing key validations
-        total_passed = sum(len(r['passed']) for r in [density_result, area_result, ratio_result, geo_result])
-        score += min(total_passed * 2, 20)  # Up to 20 bonus points
+        score += min(total_passed * 2, 20)  # Up to 20 bonus points for passing key validations
         
         return max(0.0, min(100.0, score))
         
@@ -477,12 +736,12 @@ class BoundaryValidationRules:
         if validation_result['issues']:
             summary_parts.append("🔍 Critical Issues:")
             for issue in validation_result['issues']:
-                summary_parts.append(f"   • {issue}")
+                summary_parts.append(f"   • {format_message(issue)}")
                 
         if validation_result['warnings']:
             summary_parts.append("⚠️  Warnings:")
             for warning in validation_result['warnings'][:3]:  # Show first 3
-                summary_parts.append(f"   • {warning}")
+                summary_parts.append(f"   • {format_message(warning)}")
                 
         if validation_result['recommendations']:
             summary_parts.append("💡 Recommendations:")
@@ -490,48 +749,3 @@ class BoundaryValidationRules:
                 summary_parts.append(f"   • {rec}")
                 
         return '\n'.join(summary_parts)
-
-def main():
-    """Test validation rules with sample data"""
-    validator = BoundaryValidationRules()
-    
-    # Test cases
-    test_cases = [
-        {
-            'name': 'Valid Dense City',
-            'city_data': {'name': 'Test City', 'country': 'Test', 'population_city': 5000000},
-            'boundary_area_km2': 800,
-            'coordinates': [[[0, 0], [1, 0], [1, 1], [0, 1], [0, 0]]]
-        },
-        {
-            'name': 'Implausibly Dense (Wrong Boundary)',
-            'city_data': {'name': 'Bad City', 'country': 'Test', 'population_city': 5000000},
-            'boundary_area_km2': 50,  # Would give 100k/km² density
-            'coordinates': [[[0, 0], [1, 0], [1, 1], [0, 1], [0, 0]]]
-        },
-        {
-            'name': 'Too Sparse (Metro Boundary)',
-            'city_data': {'name': 'Sparse City', 'country': 'Test', 'population_city': 1000000},
-            'boundary_area_km2': 10000,  # Would give 100/km² density
-            'coordinates': [[[0, 0], [2, 0], [2, 2], [0, 2], [0, 0]]]
-        }
-    ]
-    
-    print("🎯 Boundary Validation Rules Test")
-    print("=" * 60)
-    
-    for test_case in test_cases:
-        print(f"\n🧪 Test Case: {test_case['name']}")
-        print("-" * 40)
-        
-        result = validator.validate_boundary_quality(
-            test_case['city_data'],
-            test_case['boundary_area_km2'],
-            test_case['coordinates']
-        )
-        
-        summary = validator.get_validation_summary(result)
-        print(summary)
-        
-if __name__ == "__main__":
-    main()
\ No newline at end of file
@@ -2,72 +2,76 @@
 """
 Check for boundary files that are suspiciously large or contain incorrect data
 """
-import json
+import functools
 import os
+import re
+from itertools import chain
+from operator import itemgetter
 from pathlib import Path
 
-def calculate_bbox_area(geometry):
-    """Calculate bounding box area to estimate geographic size"""
+from json_io import load_first_feature, load_json
+
+# Boundary files left out of the check: basic placeholders, the LA County files and the Tokyo island backup
+_SKIP_FILES = re.compile(r'-basic\.geojson$|^la-county|^tokyo-island-backup\.geojson$')
+
+def coordinate_columns(geometry):
+    """
+    Return (lons, lats) columns for every ring of a MultiPolygon or the outer ring of a Polygon,
+    or None for any other geometry type
+    """
     if geometry['type'] == 'MultiPolygon':
-        all_coords = []
-        for polygon in geometry['coordinates']:
-            for ring in polygon:
-                all_coords.extend(ring)
+        # Flatten the rings into one point list in C
+        all_coords = list(chain.from_iterable(chain.from_iterable(geometry['coordinates'])))
     elif geometry['type'] == 'Polygon':
         all_coords = geometry['coordinates'][0]
     else:
-        return 0
+        return None
     
-    if not all_coords:
-        return 0
+    # Split into lon/lat columns in C rather than with per-point comprehensions
+    return list(map(itemgetter(0), all_coords)), list(map(itemgetter(1), all_coords))
+
+def _geometry_stats(geometry):
+    """Return (bbox_area, center) of a geometry from a single extraction of its coordinate columns"""
+    columns = coordinate_columns(geometry)
+    if not columns or not columns[0]:
+        return 0, [0, 0]
     
-    lons = [coord[0] for coord in all_coords]
-    lats = [coord[1] for coord in all_coords]
+    lons, lats = columns
     
     bbox_width = max(lons) - min(lons)
     bbox_height = max(lats) - min(lats)
     
-    return bbox_width * bbox_height
+    return bbox_width * bbox_height, [sum(lons)/len(lons), sum(lats)/len(lats)]
 
-def get_expected_city_center(city_id):
-    """Get expected city center from database"""
-    with open('cities-database.json', 'r') as f:
-        cities_db = json.load(f)
+def calculate_bbox_area(geometry):
+    """Calculate bounding box area to estimate geographic size"""
+    return _geometry_stats(geometry)[0]
+
+@functools.lru_cache(maxsize=1)
+def _load_cities_db():
+    """Expected [lon, lat] center of every city in the database, keyed by city id; parsed once"""
+    cities_db = load_json('cities-database.json')
     
+    centers = {}
     for city in cities_db['cities']:
-        if city['id'] == city_id:
-            return [city['coordinates'][1], city['coordinates'][0]]  # [lon, lat]
-    return None
+        # The first entry for an id wins, as with the original linear scan
+        centers.setdefault(city['id'], [city['coordinates'][1], city['coordinates'][0]])  # [lon, lat]
+    return centers
+
+def get_expected_city_center(city_id):
+    """Get expected city center from database"""
+    return _load_cities_db().get(city_id)
 
 def calculate_center(geometry):
     """Calculate approximate center of geometry"""
-    if geometry['type'] == 'MultiPolygon':
-        all_coords = []
-        for polygon in geometry['coordinates']:
-            for ring in polygon:
-                all_coords.extend(ring)
-    elif geometry['type'] == 'Polygon':
-        all_coords = geometry['coordinates'][0]
-    else:
-        return [0, 0]
-    
-    if not all_coords:
-        return [0, 0]
-    
-    lons = [coord[0] for coord in all_coords]
-    lats = [coord[1] for coord in all_coords]
-    
-    return [sum(lons)/len(lons), sum(lats)/len(lats)]
+    return _geometry_stats(geometry)[1]
 
 def check_boundary_files():
     """Check all boundary files for size and position anomalies"""
     print("🔍 Checking boundary files for size and position anomalies...")
     print("=" * 70)
     
-    boundary_files = [f for f in Path('.').glob('*.geojson') 
-                     if not f.name.endswith('-basic.geojson')
-                     and not f.name.startswith('la-county')
-                     and f.name != 'tokyo-island-backup.geojson']
+    boundary_files = [f for f in Path('.').glob('*.geojson') if not _SKIP_FILES.search(f.name)]
     
     issues = []
     
@@ -76,20 +80,18 @@ def check_boundary_files():
         file_size_kb = file_path.stat().st_size // 1024
         
         try:
-            with open(file_path, 'r') as f:
-                data = json.load(f)
+            feature = load_first_feature(file_path)
             
-            if not data.get('features'):
+            if feature is None:
                 continue
             
-            geometry = data['features'][0]['geometry']
-            properties = data['features'][0].get('properties', {})
+            geometry = feature['geometry']
+            properties = feature.get('properties', {})
             
-            # Calculate bounding box area (in degrees²)
-            bbox_area = calculate_bbox_area(geometry)
+            # Bounding box area (in degrees²) and actual center from one pass over the coordinates
+            bbox_area, actual_center = _geometry_stats(geometry)
             
-            # Get actual center vs expected center
-            actual_center = calculate_center(geometry)
+            # Get expected center to compare against
             expected_center = get_expected_city_center(city_id)
             
             # Calculate distance from expected center
@@ -4,11 +4,26 @@ City Boundary API
 Provides a simple API interface for downloading city boundaries on-demand
 Can be integrated into the city comparison tool for dynamic boundary acquisition
 """
-import json
+import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional, Any
-from intelligent_boundary_downloader import IntelligentBoundaryDownloader
+
+from json_io import load_json, save_json
+from rate_limit import wait_for_rate_limit
+
+# During a bulk download the database is written after this many changes instead of after each one
+SAVE_EVERY = 25
+
+# Concurrent downloads in bulk_download; the shared rate limiter still spaces out download starts
+MAX_WORKERS = 4
+
+# Seconds between download starts across all threads. Each download makes an Overpass search and a
+# polygons.openstreetmap.fr request, so this keeps the pool at about one request per second, no faster
+# than the downloader's own serial pace.
+REQUEST_INTERVAL = 2.0
 
 class CityBoundaryAPI:
     """
@@ -17,39 +32,85 @@ class CityBoundaryAPI:
     
     def __init__(self, database_path: str = "cities-database.json"):
         self.database_path = database_path
-        self.downloader = IntelligentBoundaryDownloader()
+        self._downloader = None
+        self._pending_changes = 0
+        self._defer_saves = False
+        # Serializes database changes made from bulk_download worker threads
+        self._lock = threading.Lock()
         self.load_database()
     
+    @property
+    def downloader(self):
+        """The boundary downloader, created on first use so lookups and --info skip its setup"""
+        if self._downloader is None:
+            with self._lock:
+                if self._downloader is None:
+                    from intelligent_boundary_downloader import IntelligentBoundaryDownloader
+                    self._downloader = IntelligentBoundaryDownloader()
+        return self._downloader
+    
     def load_database(self):
         """Load the cities database"""
         try:
-            with open(self.database_path, 'r') as f:
-                self.database = json.load(f)
+            self.database = load_json(self.database_path)
         except FileNotFoundError:
             self.database = {'cities': []}
+        
+        # Lookup indices; the first matching entry wins, as with a linear scan
+        self._by_key = {}
+        self._by_id = {}
+        # Cities grouped by lowercased country, and per-country coverage counters
+        self._by_country = {}
+        self._country_stats = {}
+        self._detailed_count = 0
+        for city in self.database['cities']:
+            self._index_city(city)
+    
+    def _index_city(self, city: Dict[str, Any]):
+        """Add a city record to the lookup indices and coverage counters"""
+        self._by_key.setdefault((city['name'].lower(), city['country'].lower()), city)
+        self._by_id.setdefault(city['id'], city)
+        self._by_country.setdefault(city['country'].lower(), []).append(city)
+        self._country_stats.setdefault(city['country'], {'total': 0, 'detailed': 0})['total'] += 1
+        if city.get('hasDetailedBoundary', False):
+            self._count_detailed(city)
+    
+    def _count_detailed(self, city: Dict[str, Any]):
+        """Count a city toward the detailed-boundary coverage totals"""
+        self._detailed_count += 1
+        self._country_stats[city['country']]['detailed'] += 1
     
     def save_database(self):
         """Save the cities database"""
-        with open(self.database_path, 'w') as f:
-            json.dump(self.database, f, indent=2)
+        save_json(self.database_path, self.database)
+        self._pending_changes = 0
+    
+    def flush(self):
+        """Save the cities database if it has unsaved changes"""
+        if self._pending_changes:
+            self.save_database()
+    
+    def _mark_changed(self):
+        """Record a database change, saving now unless a bulk download is batching writes"""
+        self._pending_changes += 1
+        if not self._defer_saves or self._pending_changes >= SAVE_EVERY:
+            self.save_database()
     
     def city_exists_in_database(self, city_name: str, country: str) -> Optional[Dict[str, Any]]:
         """Check if a city already exists in the database"""
-        city_name_lower = city_name.lower()
-        country_lower = country.lower()
-        
-        for city in self.database['cities']:
-            if (city['name'].lower() == city_name_lower and 
-                city['country'].lower() == country_lower):
-                return city
-        return None
+        return self._by_key.get((city_name.lower(), country.lower()))
     
-    def has_boundary_file(self, city_id: str) -> bool:
-        """Check if boundary file exists for a city"""
+    def has_boundary_file(self, city_id: str, present: Optional[set] = None) -> bool:
+        """
+        Check if boundary file exists for a city
+        `present` is an optional set of file names already listed from the working directory
+        """
         boundary_file = f"{city_id}.geojson"
+        if present is not None:
+            return boundary_file in present
         return Path(boundary_file).exists()
     
-    def get_boundary_info(self, city_name: str, country: str) -> Dict[str, Any]:
+    def get_boundary_info(self, city_name: str, country: str, present: Optional[set] = None) -> Dict[str, Any]:
         """
         Get boundary information for a city
         Returns status, file path, and metadata
@@ -66,9 +127,11 @@ class CityBoundaryAPI:
                 'message': f'{city_name}, {country} not found in database'
             }
         
+        return self._describe_city(city, self.has_boundary_file(city['id'], present))
+    
+    def _describe_city(self, city: Dict[str, Any], has_file: bool) -> Dict[str, Any]:
+        """Boundary information for a city record found in the database"""
         city_id = city['id']
-        has_file = self.has_boundary_file(city_id)
-        
         return {
             'status': 'in_database',
             'city': city['name'],
@@ -81,14 +144,16 @@ class CityBoundaryAPI:
             'population': city.get('population')
         }
     
-    def download_boundary_for_city(self, city_name: str, country: str, 
-                                 **kwargs) -> Dict[str, Any]:
+    def download_boundary_for_city(self, city_name: str, country: str, *,
+                                 present: Optional[set] = None, **kwargs) -> Dict[str, Any]:
         """
         Download boundary for a specific city
         
         Args:
             city_name: Name of the city
             country: Country name  
+            present: Optional set of boundary file names in the working directory, used instead of
+                     a stat per check and updated with the downloaded file
             **kwargs: Additional parameters (relation_id, state_or_province, etc.)
             
         Returns:
@@ -96,10 +161,11 @@ class CityBoundaryAPI:
         """
         print(f"🎯 Downloading boundary for {city_name}, {country}")
         
-        # Check if city exists in database
-        existing_info = self.get_boundary_info(city_name, country)
+        # Check if city exists in database; the record found here is reused below
+        city = self.city_exists_in_database(city_name, country)
         
-        if existing_info['status'] == 'in_database' and existing_info['has_boundary']:
+        if city and self.has_boundary_file(city['id'], present):
+            existing_info = self._describe_city(city, True)
             return {
                 'status': 'already_exists',
                 'message': f"Boundary already exists for {city_name}",
@@ -108,14 +174,20 @@ class CityBoundaryAPI:
             }
         
         # Attempt download
+        wait_for_rate_limit(REQUEST_INTERVAL)
         boundary_file = self.downloader.download_city_boundary(
             city_name, country, **kwargs
         )
         
         if boundary_file:
+            if present is not None:
+                present.add(os.path.basename(boundary_file))
+            
             # If city exists in database, update it
-            if existing_info['status'] == 'in_database':
-                self.update_city_boundary_status(existing_info['city_id'], boundary_file)
+            if city:
+                with self._lock:
+                    self._set_boundary(city, boundary_file)
+                    self._mark_changed()
             else:
                 # Add new city to database
                 self.add_city_to_database(city_name, country, boundary_file)
@@ -138,12 +210,18 @@ class CityBoundaryAPI:
     
     def update_city_boundary_status(self, city_id: str, boundary_file: str):
         """Update an existing city's boundary status in the database"""
-        for city in self.database['cities']:
-            if city['id'] == city_id:
-                city['hasDetailedBoundary'] = True
-                city['boundaryFile'] = boundary_file
-                break
-        self.save_database()
+        with self._lock:
+            city = self._by_id.get(city_id)
+            if city:
+                self._set_boundary(city, boundary_file)
+            self._mark_changed()
+    
+    def _set_boundary(self, city: Dict[str, Any], boundary_file: str):
+        """Record a downloaded boundary on a city record; the caller holds the lock"""
+        if not city.get('hasDetailedBoundary', False):
+            self._count_detailed(city)
+        city['hasDetailedBoundary'] = True
+        city['boundaryFile'] = boundary_file
     
     def add_city_to_database(self, city_name: str, country: str, boundary_file: str, 
                            coordinates: Optional[List[float]] = None, 
@@ -161,8 +239,10 @@ class CityBoundaryAPI:
             'boundaryFile': boundary_file
         }
         
-        self.database['cities'].append(new_city)
-        self.save_database()
+        with self._lock:
+            self.database['cities'].append(new_city)
+            self._index_city(new_city)
+            self._mark_changed()
         
         print(f"➕ Added {city_name} to cities database")
     
@@ -176,13 +256,39 @@ class CityBoundaryAPI:
         Returns:
             Dict mapping city names to download results
         """
-        results = {}
-        
         print(f"🚀 Bulk download starting for {len(cities)} cities")
         
-        for city_info in cities:
-            city_key = f"{city_info['name']}, {city_info['country']}"
-            results[city_key] = self.download_boundary_for_city(**city_info)
+        # List existing boundary files once instead of a stat per city
+        with os.scandir('.') as entries:
+            present = {entry.name for entry in entries if entry.name.endswith('.geojson')}
+        
+        # Batch database writes instead of re-encoding the whole file after every download
+        self._defer_saves = True
+        try:
+            # Only the first request for each city runs in the pool; concurrent repeats would both miss
+            # the database and add it twice
+            seen = set()
+            first, repeats = [], []
+            for index, city_info in enumerate(cities):
+                key = (city_info['name'].lower(), city_info['country'].lower())
+                (repeats if key in seen else first).append(index)
+                seen.add(key)
+            
+            download = lambda index: self.download_boundary_for_city(**cities[index], present=present)
+            
+            # Downloads are network-bound, so overlap them across a few worker threads
+            with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+                outcomes = dict(zip(first, executor.map(download, first)))
+            
+            # Repeats run afterwards, as they would have serially, so they see the first download
+            outcomes.update((index, download(index)) for index in repeats)
+            
+            results = {}
+            for index, city_info in enumerate(cities):
+                results[f"{city_info['name']}, {city_info['country']}"] = outcomes[index]
+        finally:
+            self._defer_saves = False
+            self.flush()
         
         # Summary
         successful = sum(1 for r in results.values() if r['status'] == 'success')
@@ -199,26 +305,15 @@ class CityBoundaryAPI:
     
     def get_available_cities_by_country(self, country: str) -> List[Dict[str, Any]]:
         """Get all cities in database for a specific country"""
-        country_lower = country.lower()
-        return [
-            city for city in self.database['cities'] 
-            if city['country'].lower() == country_lower
-        ]
+        return list(self._by_country.get(country.lower(), []))
     
     def get_coverage_stats(self) -> Dict[str, Any]:
         """Get statistics about boundary coverage"""
         total_cities = len(self.database['cities'])
-        detailed_cities = sum(1 for city in self.database['cities'] if city.get('hasDetailedBoundary', False))
+        detailed_cities = self._detailed_count
         
-        # Group by country
-        countries = {}
-        for city in self.database['cities']:
-            country = city['country']
-            if country not in countries:
-                countries[country] = {'total': 0, 'detailed': 0}
-            countries[country]['total'] += 1
-            if city.get('hasDetailedBoundary', False):
-                countries[country]['detailed'] += 1
+        # Counters are kept current as cities are added or updated; copy them so callers can't skew them
+        countries = {country: dict(counts) for country, counts in self._country_stats.items()}
         
         return {
             'total_cities': total_cities,
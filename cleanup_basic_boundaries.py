@@ -2,15 +2,16 @@
 """
 Clean up basic boundary files for cities that now have detailed boundaries
 """
-import json
+import os
 from pathlib import Path
 
+from json_io import load_json
+
 def main():
     """Remove basic boundary files for cities with detailed boundaries"""
     
     # Load cities database
-    with open('cities-database.json', 'r') as f:
-        database = json.load(f)
+    database = load_json('cities-database.json')
     
     # Find cities with detailed boundaries
     cities_with_detailed = []
@@ -20,6 +21,10 @@ def main():
     
     print(f"🔍 Found {len(cities_with_detailed)} cities with detailed boundaries")
     
+    # One directory listing answers every existence check below
+    with os.scandir('.') as entries:
+        present = {entry.name for entry in entries}
+    
     # Check for and remove corresponding basic files
     removed_files = []
     kept_files = []
@@ -29,10 +34,14 @@ def main():
         basic_file = Path(f"{city_id}-basic.geojson")
         detailed_file = Path(f"{city_id}.geojson")
         
-        if basic_file.exists():
-            if detailed_file.exists():
-                # Remove basic file since we have detailed version
-                basic_file.unlink()
+        if basic_file.name in present:
+            if detailed_file.name in present:
+                # Remove basic file since we have detailed version; one deleted since the listing is skipped
+                present.discard(basic_file.name)
+                try:
+                    basic_file.unlink()
+                except FileNotFoundError:
+                    continue
                 removed_files.append(str(basic_file))
                 print(f"🗑️  Removed: {basic_file}")
             else:
@@ -43,28 +52,30 @@ def main():
     # Also check for any orphaned basic files where city has detailed=true but wrong file reference
     print(f"\n🔍 Checking for orphaned basic files...")
     orphaned_basic = []
+    by_id = {}
+    for city in database['cities']:
+        by_id.setdefault(city['id'], city)
     
-    for basic_file in Path('.').glob('*-basic.geojson'):
+    for basic_file in sorted(Path(name) for name in present if name.endswith('-basic.geojson')):
         city_id = basic_file.stem.replace('-basic', '')
         
         # Find corresponding city in database
-        city_record = None
-        for city in database['cities']:
-            if city['id'] == city_id:
-                city_record = city
-                break
+        city_record = by_id.get(city_id)
         
         if city_record:
             if city_record.get('hasDetailedBoundary', False):
-                detailed_file = Path(f"{city_id}.geojson")
-                if detailed_file.exists():
+                if f"{city_id}.geojson" in present:
                     # This basic file is orphaned - city has detailed boundary
-                    basic_file.unlink()
+                    present.discard(basic_file.name)
+                    try:
+                        basic_file.unlink()
+                    except FileNotFoundError:
+                        continue
                     orphaned_basic.append(str(basic_file))
                     print(f"🗑️  Removed orphaned basic file: {basic_file}")
     
     # Count remaining basic files
-    remaining_basic = list(Path('.').glob('*-basic.geojson'))
+    remaining_basic = [name for name in present if name.endswith('-basic.geojson')]
     
     print(f"\n📊 Cleanup Summary:")
     print(f"   ✅ Cities with detailed boundaries: {len(cities_with_detailed)}")
@@ -3,41 +3,74 @@
 Compare main vs backup boundary files to find better versions
 """
 
-import json
 import os
+from operator import itemgetter, mul, sub
+from pathlib import Path
+
+from json_io import load_cache, load_first_feature, save_cache
+
+CACHE_FILE = Path('.boundary_area_cache.json')
+CACHE_VERSION = 1  # Bump whenever the area formula or the reported fields change
+
+# Cached per-file boundary info, keyed by file name
+area_cache = load_cache(CACHE_FILE, CACHE_VERSION)
 
 def calculate_polygon_area(coordinates):
     """Calculate area of polygon using shoelace formula"""
     if len(coordinates) < 3:
         return 0
     
-    area = 0
-    n = len(coordinates)
-    for i in range(n):
-        j = (i + 1) % n
-        area += coordinates[i][0] * coordinates[j][1]
-        area -= coordinates[j][0] * coordinates[i][1]
+    # Split the ring into x/y columns so the products run in C via map().
+    # Summing x[i] * (y[i+1] - y[i-1]) avoids cancelling two large sums.
+    xs = list(map(itemgetter(0), coordinates))
+    ys = list(map(itemgetter(1), coordinates))
+    area = sum(map(mul, xs, map(sub, ys[1:] + ys[:1], ys[-1:] + ys[:-1])))
     return abs(area) / 2
 
-def get_boundary_info(filename):
-    """Get boundary information from geojson file"""
-    if not os.path.exists(filename):
+def get_boundary_info(filename, present=None):
+    """
+    Get boundary information from geojson file.
+    Results are cached by file size and mtime, so unchanged files are not re-parsed.
+    `present` is an optional set of the names in the working directory; names not in it are
+    reported missing without a stat call.
+    """
+    if present is not None and filename not in present:
+        return None
+    
+    try:
+        stat = os.stat(filename)
+    except OSError:
         return None
     
+    entry = area_cache.get(filename)
+    if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+        return entry['info']
+    
+    info = measure_boundary(filename)
+    area_cache[filename] = {
+        'version': CACHE_VERSION,
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'info': info
+    }
+    return info
+
+def measure_boundary(filename):
+    """Read a geojson file and measure the area of its first feature"""
     try:
-        with open(filename, 'r') as f:
-            data = json.load(f)
+        feature = load_first_feature(filename)
         
-        if not data.get('features'):
+        if feature is None:
             return {'area': 0, 'type': 'no_features', 'error': 'No features'}
             
-        geom = data['features'][0]['geometry']
+        geom = feature['geometry']
         
         if geom['type'] == 'Polygon':
             area = calculate_polygon_area(geom['coordinates'][0])
             return {'area': area, 'type': 'Polygon', 'polygons': 1}
         elif geom['type'] == 'MultiPolygon':
-            total_area = sum(calculate_polygon_area(poly[0]) for poly in geom['coordinates'])
+            # Measure each exterior ring while its columns are hot; map() drives the per-ring calls from C
+            total_area = sum(map(calculate_polygon_area, map(itemgetter(0), geom['coordinates'])))
             return {'area': total_area, 'type': 'MultiPolygon', 'polygons': len(geom['coordinates'])}
         else:
             return {'area': 0, 'type': geom['type'], 'error': 'Unknown geometry type'}
@@ -52,14 +85,18 @@ print("Comparing boundary files:\n")
 print(f"{'City':<15} {'Main File':<20} {'Backup File':<20} {'Better Choice'}")
 print("-" * 80)
 
+# List the directory once; most backup and basic candidates don't exist
+with os.scandir('.') as entries:
+    present = {entry.name for entry in entries}
+
 for city in cities:
     main_file = f"{city}.geojson"
     backup_file = f"{city}-pipeline-backup.geojson"
     basic_file = f"{city}-basic.geojson"
     
-    main_info = get_boundary_info(main_file)
-    backup_info = get_boundary_info(backup_file)
-    basic_info = get_boundary_info(basic_file)
+    main_info = get_boundary_info(main_file, present)
+    backup_info = get_boundary_info(backup_file, present)
+    basic_info = get_boundary_info(basic_file, present)
     
     files_info = []
     if main_info:
@@ -91,4 +128,6 @@ for city in cities:
     if best_name == 'backup' and main_info and main_info['area'] < best_info['area']:
         print(f"  → Should replace {main_file} with {backup_file}")
     elif best_name == 'basic' and main_info and main_info['area'] < best_info['area']:
-        print(f"  → Should replace {main_file} with {basic_file}")
\ No newline at end of file
+        print(f"  → Should replace {main_file} with {basic_file}")
+
+save_cache(CACHE_FILE, area_cache)
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Shared JSON reading and writing for the boundary scripts.
+Parses with orjson when it is installed and falls back to the standard library otherwise.
+"""
+import json
+import mmap
+import os
+from typing import Any, Dict, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Files above this size are streamed for their first feature when ijson is installed
+STREAM_THRESHOLD_BYTES = 500 * 1024
+
+def load_json(path) -> Any:
+    """Load a JSON file, using orjson when it is installed"""
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            # An empty file cannot be mapped; read it so orjson reports the usual decode error
+            if os.fstat(f.fileno()).st_size == 0:
+                return orjson.loads(f.read())
+            # Parse straight from the page cache instead of copying the file into a bytes object
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as buf:
+                return orjson.loads(buf)
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def load_first_feature(path) -> Optional[Dict]:
+    """
+    Return the first feature of a GeoJSON file, or None if it has no features.
+    Large files are streamed so the remaining features are never materialized.
+    """
+    if ijson is not None and os.path.getsize(path) > STREAM_THRESHOLD_BYTES:
+        with open(path, 'rb') as f:
+            return next(ijson.items(f, 'features.item', use_float=True), None)
+    
+    features = load_json(path).get('features')
+    return features[0] if features else None
+
+def save_json(path, data: Any, compact: bool = False):
+    """Write a JSON file with 2-space indentation, or with no whitespace at all when `compact` is set"""
+    # Stdlib json keeps the committed \uXXXX escapes, so the output doesn't depend on orjson being
+    # installed. Encode in one call; json.dump streams many small writes through iterencode
+    text = json.dumps(data, separators=(',', ':')) if compact else json.dumps(data, indent=2)
+    with open(path, 'w') as f:
+        f.write(text)
+
+def load_cache(path, version) -> Dict:
+    """
+    Load a per-file result cache, keeping only the entries written with this cache version.
+    A missing or unreadable cache file gives an empty cache.
+    """
+    try:
+        cache = load_json(path)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict):
+        return {}
+    return {key: entry for key, entry in cache.items()
+            if isinstance(entry, dict) and entry.get('version') == version}
+
+def save_cache(path, cache: Dict):
+    """Write a per-file result cache atomically, so an interrupted run leaves the previous cache intact"""
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    try:
+        save_json(tmp_path, cache, compact=True)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def loads_json(raw: bytes) -> Any:
+    """Parse JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+"""
+Shared request rate limiter for the boundary download scripts.
+Request slots are handed out under one lock, so threads and the event loop share a single pace.
+"""
+import threading
+import time
+
+_rate_lock = threading.Lock()
+_next_request_at = 0.0
+
+def reserve_request_slot(interval):
+    """Claim the next request slot and return how many seconds the caller must wait for it"""
+    global _next_request_at
+    with _rate_lock:
+        now = time.monotonic()
+        wait = _next_request_at - now
+        _next_request_at = max(now, _next_request_at) + interval
+    return wait
+
+def wait_for_rate_limit(interval):
+    """Block until at least `interval` seconds have passed since the previous request slot, across all threads"""
+    wait = reserve_request_slot(interval)
+    if wait > 0:
+        time.sleep(wait)
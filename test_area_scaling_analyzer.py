@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Test the significant-pair filter of the area scaling analyzer against a plain pairwise scan
+"""
+import math
+import random
+
+from area_scaling_analyzer import AreaScalingAnalyzer
+
+def brute_force_pairs(densities, threshold):
+    """Every (base, target) pair whose densities differ by more than `threshold` orders of magnitude"""
+    return [(i, j) for i in range(len(densities)) for j in range(len(densities))
+            if i != j and abs(math.log10(densities[j] / densities[i])) > threshold]
+
+def test_pairs_at_exact_threshold():
+    """Ratios exactly at the threshold are not significant, and ratios that round onto it agree with the scan"""
+    densities = [1.0, 10.0, 100.0, 10.0, math.nextafter(10.0, math.inf), 0.1]
+    for threshold in (0.0, 1e-12, 1.0, 2.0):
+        assert AreaScalingAnalyzer._significant_pairs(densities, threshold) == brute_force_pairs(densities, threshold)
+
+    pairs = AreaScalingAnalyzer._significant_pairs(densities, 1.0)
+    assert (0, 1) not in pairs and (1, 0) not in pairs and (0, 2) in pairs
+
+def test_pairs_with_duplicate_areas():
+    """Cities sharing an area, a population or both give the same pairs as the pairwise scan"""
+    populations = [500000, 500000, 2000000, 8000000, 500000, 2000000]
+    areas = [100, 100, 100, 800, 1995.2623149688798, 800]
+    densities = [p / a for p, a in zip(populations, areas)]
+    for threshold in (0.3, 0.5, math.log10(densities[0] / densities[4])):
+        assert AreaScalingAnalyzer._significant_pairs(densities, threshold) == brute_force_pairs(densities, threshold)
+
+def test_pairs_on_random_densities():
+    """Random densities, with ratios placed on and just inside the threshold, match the pairwise scan"""
+    rng = random.Random(7)
+    for _ in range(200):
+        densities = [10 ** rng.uniform(-2, 5) for _ in range(rng.randint(0, 40))]
+        for threshold in (0.3, 0.5):
+            if densities:
+                base = rng.choice(densities)
+                densities += [base, base * 10 ** threshold, base / 10 ** threshold]
+            assert AreaScalingAnalyzer._significant_pairs(densities, threshold) == brute_force_pairs(densities, threshold)
+
+def test_pairs_on_database():
+    """The insight metrics of the shipped statistics database match the pairwise scan"""
+    analyzer = AreaScalingAnalyzer()
+    for metric, threshold in (('population_density', 0.3), ('gdp_per_km2_millions', 0.5)):
+        densities = analyzer.densities[metric]
+        assert AreaScalingAnalyzer._significant_pairs(densities, threshold) == brute_force_pairs(densities, threshold)
+
+if __name__ == "__main__":
+    test_pairs_at_exact_threshold()
+    test_pairs_with_duplicate_areas()
+    test_pairs_on_random_densities()
+    test_pairs_on_database()
+    print("✅ Significant pairs match the pairwise scan")
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Test the boundary validation rules on sample cities
+"""
+
+from boundary_validation_rules import BoundaryValidationRules, pack_ring
+
+SQUARE = [[[0, 0], [1, 0], [1, 1], [0, 1], [0, 0]]]
+ELONGATED = [[[0, 0], [30, 0], [30, 1], [0, 1], [0, 0]]]
+
+def sample_cases():
+    """(city_data, boundary_area_km2, coordinates) cases spanning every band, gate and missing-data path"""
+    populations = [0, 50000, 480000, 1000000, 5000000, 12000000]
+    areas = [0, 0.5, 5, 50, 300, 800, 2500, 10000, 40000]
+    return [({'name': f'City {p}/{a}', 'country': 'Test', 'population_city': p}, a,
+             ELONGATED if k % 2 else SQUARE)
+            for k, (p, a) in enumerate((p, a) for p in populations for a in areas)]
+
+def test_validate_many_matches_full_validation():
+    """The serial batch screen reports the same failed gates and issues as per-case validation"""
+    validator = BoundaryValidationRules()
+    cases = sample_cases()
+    
+    screened = validator.validate_many(cases, n_jobs=1)
+    
+    assert len(screened) == len(cases)
+    for case, result in zip(cases, screened):
+        full = validator.validate_boundary_quality(*case)
+        assert result['failed_gates'] == full['failed_gates'], case[:2]
+        assert result['issues'] == full['issues'], case[:2]
+
+def test_validate_many_parallel_matches_serial():
+    """Worker processes return the same results as the serial path, in input order"""
+    validator = BoundaryValidationRules()
+    cases = sample_cases() * 3
+    serial = validator.validate_many(cases, n_jobs=1)
+    
+    # Drop the threshold so the small sample takes the process-pool path
+    validator.PARALLEL_MIN_CASES = 1
+    assert validator.validate_many(cases, n_jobs=2) == serial
+    assert validator.validate_many(cases, n_jobs=-1) == serial
+
+def test_validate_many_rejects_zero_jobs():
+    """n_jobs=0 is an error rather than a pool with no workers"""
+    validator = BoundaryValidationRules()
+    try:
+        validator.validate_many(sample_cases(), n_jobs=0)
+    except ValueError:
+        return
+    raise AssertionError('n_jobs=0 was accepted')
+
+def test_fast_reject_only_skips_after_density_failure():
+    """fast_reject changes nothing unless the density gate fails, and never changes the verdict"""
+    validator = BoundaryValidationRules()
+    for case in sample_cases():
+        full = validator.validate_boundary_quality(*case)
+        fast = validator.validate_boundary_quality(*case, fast_reject=True)
+        
+        if not any(gate.startswith('density_') for gate in full['failed_gates']):
+            assert fast == full, case[:2]
+            continue
+            
+        assert fast['overall_quality'] == full['overall_quality'] == 'rejected', case[:2]
+        assert set(fast['failed_gates']) <= set(full['failed_gates']), case[:2]
+        assert all(gate.startswith('density_') for gate in fast['failed_gates'] + fast['passed_gates']), case[:2]
+
+def test_nearest_reference_matches_brute_force():
+    """nearest_reference picks the same benchmark as a scan over every tier, first match winning ties"""
+    validator = BoundaryValidationRules()
+    benchmarks = [(tier, ref) for tier, refs in validator.reference_benchmarks.items() for ref in refs]
+    densities = sorted({ref['density'] for _, ref in benchmarks})
+    
+    # Every benchmark density, the midpoints between neighbours (ties) and values beyond either end
+    probes = densities + [(a + b) / 2 for a, b in zip(densities, densities[1:])] + [0, 1e6]
+    for density in probes:
+        best_tier, best = benchmarks[0]
+        for tier, ref in benchmarks:
+            if abs(ref['density'] - density) < abs(best['density'] - density):
+                best_tier, best = tier, ref
+        assert validator.nearest_reference(density) == dict(best, tier=best_tier), density
+
+def test_packed_rings_validate_like_nested_rings():
+    """A ring packed with pack_ring gives the same result as the nested lists, including on revalidation"""
+    validator = BoundaryValidationRules()
+    for city_data, area, coordinates in sample_cases():
+        packed = [pack_ring(coordinates[0])]
+        nested = validator.validate_boundary_quality(city_data, area, coordinates)
+        assert validator.validate_boundary_quality(city_data, area, packed) == nested
+        assert validator.validate_boundary_quality(city_data, area, packed) == nested
+
+def test_boundary_validation():
+    """Test validation rules with sample data"""
+    validator = BoundaryValidationRules()
+    
+    # Test cases
+    test_cases = [
+        {
+            'name': 'Valid Dense City',
+            'city_data': {'name': 'Test City', 'country': 'Test', 'population_city': 5000000},
+            'boundary_area_km2': 800,
+            'coordinates': [[[0, 0], [1, 0], [1, 1], [0, 1], [0, 0]]]
+        },
+        {
+            'name': 'Implausibly Dense (Wrong Boundary)',
+            'city_data': {'name': 'Bad City', 'country': 'Test', 'population_city': 5000000},
+            'boundary_area_km2': 50,  # Would give 100k/km² density
+            'coordinates': [[[0, 0], [1, 0], [1, 1], [0, 1], [0, 0]]]
+        },
+        {
+            'name': 'Too Sparse (Metro Boundary)',
+            'city_data': {'name': 'Sparse City', 'country': 'Test', 'population_city': 1000000},
+            'boundary_area_km2': 10000,  # Would give 100/km² density
+            'coordinates': [[[0, 0], [2, 0], [2, 2], [0, 2], [0, 0]]]
+        }
+    ]
+    
+    print("🎯 Boundary Validation Rules Test")
+    print("=" * 60)
+    
+    for test_case in test_cases:
+        print(f"\n🧪 Test Case: {test_case['name']}")
+        print("-" * 40)
+        
+        result = validator.validate_boundary_quality(
+            test_case['city_data'],
+            test_case['boundary_area_km2'],
+            test_case['coordinates']
+        )
+        
+        summary = validator.get_validation_summary(result)
+        print(summary)
+        
+if __name__ == "__main__":
+    test_boundary_validation()
+    test_validate_many_matches_full_validation()
+    test_validate_many_parallel_matches_serial()
+    test_validate_many_rejects_zero_jobs()
+    test_fast_reject_only_skips_after_density_failure()
+    test_nearest_reference_matches_brute_force()
+    test_packed_rings_validate_like_nested_rings()
+    print("\n✅ Batch, fast-reject, reference and packed-ring checks passed")